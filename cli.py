@@ -0,0 +1,92 @@
+# Command line entry points for the parts of the app that do not need Streamlit: the FantasyPros
+# projection pipeline, KTC valuation of every Sleeper player and Sleeper league evaluation.
+# Run from the repository root, e.g. `python cli.py projections` or `python cli.py leagues <league_id>`.
+
+import sys
+import argparse
+import pandas as pd
+
+from utils.projections import COMBINED_DATA_PATH, DATA_TABLES_DIR, build_combined_data, load_projection_tables, write_combined_data
+
+def run_projections(args):
+    """Build the combined projections once, so the app reads the result instead of recomputing it"""
+    combined_data = build_combined_data(load_projection_tables(args.data_dir))
+    write_combined_data(combined_data, args.output)
+    print(f"Wrote {len(combined_data)} players to {args.output}", file=sys.stderr)
+    return 0
+
+def run_ktc(args):
+    """Scrape KTC and value every Sleeper player it ranks"""
+    from scraper.ktc_to_csv import scrape_ktc
+    from utils.ktc_index import build_ktc_index, value_players
+    from utils.sleeper_players_store import load_players_store
+
+    ktc_index = build_ktc_index(pd.DataFrame(scrape_ktc()))
+    players_df = load_players_store()
+    values = value_players(players_df, ktc_index)
+
+    valued_df = players_df.loc[values.notna(), ["full_name", "position", "team"]].assign(**{"KTC Value": values.dropna()})
+    valued_df = valued_df.rename_axis("player_id").reset_index().sort_values(by="KTC Value", ascending=False)
+    valued_df.to_csv(args.output, index=False)
+    print(f"Wrote {len(valued_df)} KTC-valued players to {args.output}", file=sys.stderr)
+    return 0
+
+def run_leagues(args):
+    from utils.league_batch import main as league_batch_main
+
+    return league_batch_main(args.extra_args)
+
+def run_import_budget(args):
+    """Time every page's imports and fail when one is over its budget"""
+    from utils.import_budget import check_import_budgets, eagerly_imported_modules
+
+    results, within_budget = check_import_budgets(repeats=args.repeats)
+    for page_path, seconds, budget in results:
+        status = "ok" if seconds <= budget else "OVER BUDGET"
+        print(f"{page_path:45} {seconds * 1000:8.1f} ms  (budget {budget * 1000:.0f} ms)  {status}")
+    eager_modules = eagerly_imported_modules()
+    if eager_modules:
+        print(f"Imported at page load but should be lazy: {', '.join(eager_modules)}")
+    return 0 if within_budget and not eager_modules else 1
+
+def run_profile_report(args):
+    """Print the slowest functions of a saved page profile"""
+    from utils.profiling import top_functions
+
+    print(top_functions(args.path, limit=args.limit).to_string(index=False))
+    return 0
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Fantasy football data pipelines without the Streamlit app")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    projections_parser = subparsers.add_parser("projections", help="Build the combined FantasyPros projections")
+    projections_parser.add_argument("--data-dir", default=DATA_TABLES_DIR, help="Directory with the FantasyPros CSV exports")
+    projections_parser.add_argument("--output", default=COMBINED_DATA_PATH, help="Parquet file the app reads the combined data from")
+    projections_parser.set_defaults(run=run_projections)
+
+    ktc_parser = subparsers.add_parser("ktc", help="Value every Sleeper player ranked by KeepTradeCut")
+    ktc_parser.add_argument("--output", default="ktc_player_values.csv", help="CSV file to write the values to")
+    ktc_parser.set_defaults(run=run_ktc)
+
+    leagues_parser = subparsers.add_parser("leagues", help="Compare KTC roster values across Sleeper leagues (takes the arguments of python -m utils.league_batch)", add_help=False)
+    leagues_parser.set_defaults(run=run_leagues)
+
+    import_budget_parser = subparsers.add_parser("import-budget", help="Check each page's import time against its budget")
+    import_budget_parser.add_argument("--repeats", type=int, default=3, help="Cold imports per page, the fastest one counts")
+    import_budget_parser.set_defaults(run=run_import_budget)
+
+    profile_report_parser = subparsers.add_parser("profile-report", help="Show the slowest functions of a saved page profile")
+    profile_report_parser.add_argument("path", help="pstats file written with ?profile=1 or FF_PROFILE=1")
+    profile_report_parser.add_argument("--limit", type=int, default=25, help="Number of functions to show")
+    profile_report_parser.set_defaults(run=run_profile_report)
+
+    # Only the leagues command passes its arguments on, every other command rejects unknown ones
+    args, extra_args = parser.parse_known_args(argv)
+    if extra_args and args.command != "leagues":
+        parser.error(f"unrecognized arguments: {' '.join(extra_args)}")
+    args.extra_args = extra_args
+    return args.run(args)
+
+if __name__ == "__main__":
+    sys.exit(main())
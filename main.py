@@ -1,11 +1,24 @@
 # This is a streamlit app that helps users prepare for their fantasy football drafts.
 # It uses Fantasy Pros Projections CSV data to provide insights and recommendations.
 
+import os
+import contextlib
 import streamlit as st
 
 from utils.fantasy_pros_combined_data import create_combined_data
+from utils.sleeper_shared_data import data_ages, start_background_refresh
+from utils.background_refresh import format_age
+from utils.timing import TIMING_LOG_ENV_VAR, append_spans_jsonl, begin_rerun, end_rerun, span, spans_frame, timing_requested
+from utils.profiling import profiled, profiling_requested, top_functions
 
-create_combined_data()
+# Stage timings for this rerun, shown in the sidebar (?timing=1 or FF_TIMING=1)
+timing_enabled = timing_requested(st.query_params)
+if timing_enabled:
+    begin_rerun()
+
+with span("main.create_combined_data"):
+    create_combined_data()
+start_background_refresh()
 
 st.set_page_config(page_title="Fantasy Football Draft Prep", layout="wide")
 st.title("Welcome to Fantasy Football Draft Prep!")
@@ -14,22 +27,48 @@ st.write("Use the sidebar to navigate between pages.")
 free_agents_page = st.Page("pages/espn/free_agents_espn.py", title="Free Agents in ESPN")
 data_overview_page = st.Page("pages/espn/data_overview.py", title="Data Overview")
 live_draft_page = st.Page("pages/espn/live_draft.py", title="Live Draft")
+lineup_planner_page = st.Page("pages/espn/lineup_planner.py", title="Season Lineup Planner")
 
 sleeper_integration_page = st.Page("pages/sleeper/sleeper_integration.py", title="Sleeper Integration")
+league_batch_page = st.Page("pages/sleeper/league_batch.py", title="League Batch Comparison")
 
 pg = st.navigation(
     {
         "ESPN Integration": [
             free_agents_page,
             data_overview_page,
-            live_draft_page
+            live_draft_page,
+            lineup_planner_page
         ],
         "Sleeper Integration": [
-            sleeper_integration_page
+            sleeper_integration_page,
+            league_batch_page
         ]
     }
 )
 
-pg.run()
+with st.sidebar:
+    st.caption("Data age: " + " · ".join(f"{name} {format_age(age)}" for name, age in data_ages()))
+
+# Function-level profile of the page run, saved as a pstats file (?profile=1 or FF_PROFILE=1)
+page_profiler = profiled(pg.title) if profiling_requested(st.query_params) else contextlib.nullcontext()
+try:
+    with span(f"page {pg.title}"), page_profiler as profile:
+        pg.run()
+finally:
+    # Also when the page stops, reruns or raises, so its spans never leak into the next rerun
+    if timing_enabled:
+        spans = end_rerun()
+        if os.environ.get(TIMING_LOG_ENV_VAR):
+            append_spans_jsonl(os.environ[TIMING_LOG_ENV_VAR], pg.title, spans)
+
+if profile is not None:
+    with st.sidebar.expander("Profile"):
+        st.caption(f"Saved to {profile['path']}")
+        st.dataframe(top_functions(profile["path"]), hide_index=True)
+
+if timing_enabled:
+    with st.sidebar.expander("Stage Timings", expanded=True):
+        st.dataframe(spans_frame(spans), hide_index=True)
 
 # st.switch_page(sleeper_integration_page)
\ No newline at end of file
@@ -1,28 +1,30 @@
 import streamlit as st
 import pandas as pd
 
+from utils.fantasy_pros_combined_data import session_memory_bytes, set_uploaded_table
+
 def data_overview_tab():
     cols = st.columns(5)
     with cols[0]:
         uploaded_dst = st.file_uploader("Upload New DST CSV from FantasyPros", type="csv", key="dst_uploader")
         if uploaded_dst:
-            st.session_state["dst_data"] = pd.read_csv(uploaded_dst)
+            set_uploaded_table("dst_data", pd.read_csv(uploaded_dst))
     with cols[1]:
         uploaded_flx = st.file_uploader("Upload New FLX CSV from FantasyPros", type="csv", key="flx_uploader")
         if uploaded_flx:
-            st.session_state["flx_data"] = pd.read_csv(uploaded_flx)
+            set_uploaded_table("flx_data", pd.read_csv(uploaded_flx))
     with cols[2]:
         uploaded_k = st.file_uploader("Upload New K CSV from FantasyPros", type="csv", key="k_uploader")
         if uploaded_k:
-            st.session_state["k_data"] = pd.read_csv(uploaded_k)
+            set_uploaded_table("k_data", pd.read_csv(uploaded_k))
     with cols[3]:
         uploaded_qb = st.file_uploader("Upload New QB CSV from FantasyPros", type="csv", key="qb_uploader")
         if uploaded_qb:
-            st.session_state["qb_data"] = pd.read_csv(uploaded_qb)
+            set_uploaded_table("qb_data", pd.read_csv(uploaded_qb))
     with cols[4]:
         uploaded_adp = st.file_uploader("Upload New ADP CSV from FantasyPros", type="csv", key="adp_uploader")
         if uploaded_adp:
-            st.session_state["adp_data"] = pd.read_csv(uploaded_adp)
+            set_uploaded_table("adp_data", pd.read_csv(uploaded_adp))
 
     data_tabs = st.tabs(["DST", "FLX", "K", "QB", "ADP"])
 
@@ -64,5 +66,9 @@ def data_overview_tab():
             st.subheader(position)
             st.dataframe(combined_data[combined_data["POS"] == position].sort_values(by="FPTS_Rank"), hide_index=True)
 
+    # Uploaded tables and the combined data built from them are the only frames a session owns
+    session_bytes, shared_bytes = session_memory_bytes()
+    st.caption(f"Session memory: {session_bytes / 1024:,.0f} KB owned by this session, {shared_bytes / 1024:,.0f} KB shared with other sessions")
+
 st.set_page_config(page_title="Data Overview", layout="wide")
 data_overview_tab()
@@ -1,7 +1,19 @@
 import streamlit as st
 import pandas as pd
 from datetime import datetime
-from espn_api import football
+
+from utils.nfl_teams import build_dst_index, resolve_team
+from utils.espn_free_agents import (
+    build_improvement_table,
+    build_position_points_index,
+    build_projection_matrix,
+    get_remaining_weeks,
+    rank_free_agents_by_window,
+    summarize_free_agent_positions
+)
+from utils.espn_roster import get_team_lineup_df
+from utils.free_agent_watchlist import diff_to_dataframe, lookup_vorp, poll_watchlist, watchlist_history_dataframe
+from utils.timing import span
 
 def free_agents_espn_tab():
     combined_data = st.session_state["combined_data"]
@@ -16,8 +28,10 @@ def free_agents_espn_tab():
 
     @st.cache_data(ttl=3600)  # Cache for 1 hour
     def get_league():
+        from espn_api import football
         return football.League(st.session_state["espn_league_id"], st.session_state["espn_year"])
-    league = get_league()
+    with span("espn.league"):
+        league = get_league()
 
     with cols[2]:
         st.session_state["selected_team"] = st.selectbox("Select your team:", options=league.teams, index=7)
@@ -30,7 +44,8 @@ def free_agents_espn_tab():
 
 
     with st.expander("Top Free Agents For Full Season using FantasyPros Projections"):
-        free_agents = list(league.free_agents(size=1000))
+        with span("espn.season_free_agents"):
+            free_agents = list(league.free_agents(size=1000))
         free_agent_names = []
         for player in free_agents:
             free_agent_names.append(player.__getattribute__("name"))
@@ -48,22 +63,9 @@ def free_agents_espn_tab():
 
         dst_data = merged_df[merged_df["POS"] == "DST"]
 
-        # Try to fuzzy match DST players with combined data, the issue is that in the Combined Data a Team will be called "San Francisco 49ers", but in the Free Agents it will be "49ers"
-        def fuzzy_match_dst_players(dst_data, combined_data):
-            dst_teams = dst_data["Player"].values
-            combined_players = combined_data["Player"].values
-            matched_teams = []
-            for dst_team in dst_teams:
-                # Fuzzy match the team 
-                matched = None
-                for combined_player in combined_players:
-                    if dst_team in combined_player and dst_team != combined_player:
-                        matched = combined_player
-                        break
-                matched_teams.append(matched)
-            return matched_teams
-
-        dst_data["Player"] = fuzzy_match_dst_players(dst_data, combined_data)
+        # Resolve DST players to the combined data names, the issue is that in the Combined Data a Team will be called "San Francisco 49ers", but in the Free Agents it will be "49ers"
+        dst_index = build_dst_index(combined_data)
+        dst_data["Player"] = dst_data["Player"].map(lambda name: dst_index.get(resolve_team(name)))
         dst_data = dst_data.dropna(subset=["Player"])
         dst_data = dst_data[["Player", "POS"]]
         dst_data = pd.merge(dst_data, combined_data, on=["Player", "POS"], how="left")
@@ -74,9 +76,27 @@ def free_agents_espn_tab():
 
         st.dataframe(merged_df, hide_index=True)
 
+    with st.expander("Top Free Agents For Rest of Season using ESPN Projections"):
+        remaining_weeks = get_remaining_weeks(league)
+        window_weeks = st.number_input("Upcoming weeks window:", min_value=1, max_value=max(len(remaining_weeks), 1), value=min(3, max(len(remaining_weeks), 1)))
+        if st.toggle("Load rest of season projections", value=False):
+            # Weekly free agent pools are fetched concurrently and cached per week
+            with span("espn.projection_matrix"):
+                player_info_df, projection_matrix = build_projection_matrix(
+                    league,
+                    st.session_state["espn_league_id"],
+                    st.session_state["espn_year"],
+                    remaining_weeks
+                )
+                rankings_df = rank_free_agents_by_window(player_info_df, projection_matrix, window_weeks=window_weeks)
+            st.dataframe(rankings_df, hide_index=True)
+            with st.expander("Weekly Projection Matrix"):
+                st.dataframe(player_info_df[["name"]].join(projection_matrix.add_prefix("Week ")), hide_index=True)
+
     st.subheader("Top Free Agents For Week by Projected Points using ESPN Projections")
 
-    free_agents_week = list(league.free_agents(size=1000, week=week_number))
+    with span("espn.week_free_agents"):
+        free_agents_week = list(league.free_agents(size=1000, week=week_number))
 
     player_dict = {}
     for player in free_agents_week:
@@ -95,47 +115,64 @@ def free_agents_espn_tab():
 
     unique_positions = free_agents_week_df["position"].unique()
 
-    box_scores = league.box_scores(week=week_number)
-
-    selected_roster = None
-    for box_score in box_scores:
-        if box_score.home_team.team_id == st.session_state["selected_team"].team_id:
-            selected_roster = box_score.home_lineup
-            break
-        elif box_score.away_team.team_id == st.session_state["selected_team"].team_id:
-            selected_roster = box_score.away_lineup
-            break
+    with st.expander("Free Agent Watchlist"):
+        watch_cols = st.columns(2)
+        with watch_cols[0]:
+            watch_mode = st.toggle("Watch mode", value=False, key="free_agent_watch_mode")
+        with watch_cols[1]:
+            poll_seconds = st.number_input("Poll every (seconds):", min_value=30, value=300, step=30)
+
+        # Only this fragment reruns on each poll, the full free agent table above is not re-rendered
+        def free_agent_watchlist_panel():
+            league_id = st.session_state["espn_league_id"]
+            year = st.session_state["espn_year"]
+            if watch_mode:
+                diff = poll_watchlist(league_id, year, week_number, league.free_agents(size=1000, week=week_number))
+                latest_df = diff_to_dataframe(diff)
+                latest_df["VORP"] = lookup_vorp(latest_df["name"].fillna(""), combined_data)
+                st.markdown(f"###### Latest Poll: {len(diff['added'])} added, {len(diff['dropped'])} dropped, {len(diff['changed'])} projection changes")
+                new_names_df = latest_df[(latest_df["change"] == "added") & (latest_df["VORP"] > 0)].sort_values(by="VORP", ascending=False)
+                if not new_names_df.empty:
+                    st.success("New high-VORP free agents: " + ", ".join(new_names_df["name"]))
+
+            st.markdown("###### Watchlist History")
+            st.dataframe(watchlist_history_dataframe(league_id, year, week_number, combined_data), hide_index=True)
+
+        st.fragment(free_agent_watchlist_panel, run_every=poll_seconds if watch_mode else None)()
+
+    # Only fetch the selected team's lineup, cached per team and week
+    with span("espn.team_lineup"):
+        roster_df = get_team_lineup_df(
+            league,
+            st.session_state["espn_league_id"],
+            st.session_state["espn_year"],
+            st.session_state["selected_team"].team_id,
+            week_number
+        )
     with st.expander(f"Your Team's Roster for Week {week_number}:"):
-        roster_dict = {}
-        for player in selected_roster:
-            roster_dict[player.name] = player.__dict__
-        roster_df = pd.DataFrame.from_dict(roster_dict, orient="index")
-        roster_df = roster_df[["name", "projected_points", "position", "posRank", "proTeam", "injuryStatus"]]
         st.dataframe(roster_df, hide_index=True)
 
+    # Precompute per-position sorted projections and the improvement table in one grouped pass
+    with span("espn.improvement_table"):
+        free_agents_by_position = dict(tuple(free_agents_week_df.groupby("position", sort=False)))
+        position_summary = summarize_free_agent_positions(free_agents_week_df)
+        points_index = build_position_points_index(free_agents_week_df)
+        improvement_table = build_improvement_table(roster_df, free_agents_week_df, points_index, position_summary)
+        improvement_by_position = dict(tuple(improvement_table.groupby("position", sort=False)))
+
     cols = st.columns(len(unique_positions))
 
     for col, pos in zip(cols, unique_positions):
         with col:
             st.subheader(pos)
-            st.dataframe(free_agents_week_df[free_agents_week_df["position"] == pos], hide_index=True, height=160)
-            max_proj_points = free_agents_week_df[free_agents_week_df['position'] == pos]['projected_points'].max()
-            max_player_name = free_agents_week_df[free_agents_week_df['position'] == pos][free_agents_week_df['position'] == pos]['name'].values[0]
+            st.dataframe(free_agents_by_position[pos], hide_index=True, height=160)
+            max_proj_points = position_summary.at[pos, "max_proj_points"]
+            max_player_name = position_summary.at[pos, "max_player_name"]
             st.write(f"Most Projected Points: {max_proj_points}\n({max_player_name})")
 
-            roster_position_df = roster_df[roster_df["position"] == pos]
-            roster_position_df["improvement"] = max_proj_points - roster_position_df["projected_points"]
-            roster_position_df = roster_position_df[roster_position_df["improvement"] > 0]
-            # Count the number of players in the free agent pool that are better options than this row
-            roster_position_df["# Options"] = roster_position_df.apply(
-                lambda row: (free_agents_week_df[
-                    (free_agents_week_df["position"] == pos) &
-                    (free_agents_week_df["projected_points"] > row["projected_points"])
-                ].shape[0]), axis=1)
-
             st.markdown(f"###### Potential Improvement:")
-            improvement_df = roster_position_df[["name", "improvement", "# Options"]].sort_values(by="improvement", ascending=False)
-            st.dataframe(improvement_df, hide_index=True)
+            improvement_df = improvement_by_position.get(pos, improvement_table.iloc[0:0])
+            st.dataframe(improvement_df[["name", "improvement", "# Options"]], hide_index=True)
 
 st.set_page_config(page_title="Free Agents in ESPN", layout="wide")
 free_agents_espn_tab()
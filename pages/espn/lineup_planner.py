@@ -0,0 +1,74 @@
+import streamlit as st
+import pandas as pd
+from datetime import datetime
+
+from utils.espn_free_agents import get_remaining_weeks
+from utils.espn_roster import build_roster_projection_matrix
+from utils.lineup_optimizer import BYE_CRUNCH_THRESHOLD, load_bye_weeks, plan_season_lineups, team_lineup_table
+from utils.timing import span
+
+@st.cache_data(ttl=3600)  # Cache for 1 hour
+def get_league(league_id, year):
+    from espn_api import football
+    return football.League(league_id, year)
+
+def league_players_frame(league):
+    """Every rostered player in the league with the team that rosters them and their projected weekly average"""
+    rows = []
+    for team in league.teams:
+        for player in team.roster:
+            rows.append({
+                "team_id": team.team_id,
+                "team_name": team.team_name,
+                "playerId": player.playerId,
+                "name": player.name,
+                "position": player.position,
+                "proTeam": player.proTeam,
+                "weekly_points": player.projected_avg_points,
+            })
+    return pd.DataFrame(rows, columns=["team_id", "team_name", "playerId", "name", "position", "proTeam", "weekly_points"])
+
+def lineup_planner_tab():
+    st.header("Season Lineup Planner")
+    st.write("Best starting lineup for every remaining week, for every team in your ESPN league, using ESPN's weekly projections for each player (their projected weekly average where a week has none) and the bye weeks from the FantasyPros ADP data.")
+
+    cols = st.columns(3)
+    with cols[0]:
+        league_id = st.number_input("Enter your ESPN League ID:", value=st.session_state.get("espn_league_id", 1462856))
+    with cols[1]:
+        year = st.number_input("Enter your ESPN Year:", value=st.session_state.get("espn_year", datetime.now().year))
+    with span("espn.league"):
+        league = get_league(league_id, year)
+
+    weeks = get_remaining_weeks(league)
+    bye_weeks = load_bye_weeks(st.session_state["adp_data"])
+    players_df = league_players_frame(league)
+    with span("espn.weekly_projections"):
+        projection_matrix = build_roster_projection_matrix(league, league_id, year, weeks)
+
+    # All teams and weeks are solved together, with and without byes
+    with span("lineups.plan"):
+        plan = plan_season_lineups(players_df, projection_matrix.reindex(players_df["playerId"]).to_numpy(), weeks, bye_weeks, league.settings.position_slot_counts)
+
+    st.subheader("Projected Lineup Points by Week")
+    with span("plotly.weekly_points"):
+        import plotly.express as px
+        fig = px.imshow(plan["weekly_points"], labels={"x": "Week", "y": "Team", "color": "Projected Points"}, aspect="auto", color_continuous_scale="RdYlGn")
+        st.plotly_chart(fig, use_container_width=True)
+    with st.expander("Projected Lineup Points Data"):
+        st.dataframe(plan["weekly_points"].round(1))
+
+    st.subheader("Bye Week Crunches")
+    st.write(f"Weeks where byes cost a team at least {BYE_CRUNCH_THRESHOLD:.0%} of its full-strength lineup.")
+    if plan["bye_crunch"].empty:
+        st.write("No team loses a significant share of its lineup to byes.")
+    else:
+        st.dataframe(plan["bye_crunch"].style.format({"Share Lost": "{:.1%}"}), hide_index=True)
+
+    st.subheader("Weekly Lineups")
+    team_names = dict(zip(players_df["team_id"], players_df["team_name"]))
+    team_id = st.selectbox("Select Team:", options=plan["team_ids"], format_func=lambda team_id: team_names[team_id])
+    st.dataframe(team_lineup_table(plan, team_id, weeks))
+
+st.set_page_config(page_title="Season Lineup Planner", layout="wide")
+lineup_planner_tab()
@@ -3,21 +3,13 @@ import pandas as pd
 
 HEAD_COUNT = 5
 
-# Load data
-st.session_state["dst_data"] = pd.read_csv("./data_tables/FantasyPros_Fantasy_Football_Projections_DST.csv")
-st.session_state["flx_data"] = pd.read_csv("./data_tables/FantasyPros_Fantasy_Football_Projections_FLX.csv")
-st.session_state["k_data"] = pd.read_csv("./data_tables/FantasyPros_Fantasy_Football_Projections_K.csv")
-st.session_state["qb_data"] = pd.read_csv("./data_tables/FantasyPros_Fantasy_Football_Projections_QB.csv")
-st.session_state["adp_data"] = pd.read_csv("./data_tables/FantasyPros_2025_Overall_ADP_Rankings.csv", on_bad_lines='skip')
-
 def live_draft_tab():
 
-    combined_data = st.session_state["combined_data"]
+    # The combined data is shared between sessions, so sort a copy for this run instead of in place
+    combined_data = st.session_state["combined_data"].sort_values(by="ADP")
     
     st.header("Live Draft")
 
-    combined_data.sort_values(by="ADP", inplace=True)
-
     # Multiselect for drafted players
     drafted_players = st.multiselect(
         "Mark players as drafted:",
@@ -0,0 +1,64 @@
+import streamlit as st
+
+from utils.league_batch import LEAGUE_WORKERS, run_batch, snapshot_batch
+from utils.timing import span
+
+@st.cache_data(ttl=300)  # Cache for 5 minutes per set of leagues
+def get_league_comparison(league_ids, max_workers):
+    return run_batch(list(league_ids), max_workers=max_workers)
+
+def league_batch_tab():
+    st.header("Sleeper League Batch Comparison")
+    st.write("Value every team in many Sleeper leagues at once. KTC values, the players database and the NFL schedule are loaded once and shared by all leagues.")
+
+    league_ids_text = st.text_area("Sleeper League IDs (one per line or comma separated):", value="1180366350202068992")
+    max_workers = st.number_input("Leagues to evaluate at once:", min_value=1, max_value=16, value=LEAGUE_WORKERS)
+
+    # Keep the order the leagues were entered in, without duplicates
+    league_ids = tuple(dict.fromkeys(league_id.strip() for league_id in league_ids_text.replace(",", "\n").splitlines() if league_id.strip()))
+    if not league_ids:
+        st.info("Enter at least one league ID.")
+        return
+
+    with st.spinner(f"Evaluating {len(league_ids)} leagues..."), span("batch.evaluate_leagues"):
+        comparison_df, errors = get_league_comparison(league_ids, int(max_workers))
+
+    for league_id, error in errors.items():
+        st.warning(f"Could not evaluate league {league_id}: {error}")
+
+    if comparison_df.empty:
+        st.write("No leagues could be evaluated.")
+        return
+
+    # Unchanged team values are not written again, so this is cheap on every rerun
+    with span("batch.snapshot"):
+        snapshot_batch(comparison_df)
+
+    st.subheader("All Teams")
+    st.dataframe(comparison_df, hide_index=True)
+    st.download_button("Download CSV", comparison_df.to_csv(index=False), file_name="league_comparison.csv", mime="text/csv")
+
+    st.subheader("League Summary")
+    league_summary_df = comparison_df.groupby(["League ID", "League Name"]).agg(
+        teams=("User", "size"),
+        total_ktc_value=("Total KTC Value", "sum"),
+        top_team=("Team Name", "first"),
+        top_team_ktc_value=("Total KTC Value", "max"),
+    ).reset_index()
+    st.dataframe(league_summary_df, hide_index=True)
+
+    # Each league's teams as a stacked bar, so every league's value spread can be compared at a glance
+    with span("plotly.league_values"):
+        import plotly.express as px
+        fig = px.bar(
+            comparison_df,
+            x="League Name",
+            y="Total KTC Value",
+            color="League KTC Rank",
+            hover_data=["Team Name", "User", "Player KTC Value", "Draft Picks KTC Value"],
+            title="Total KTC Value by League",
+        )
+        st.plotly_chart(fig, use_container_width=True)
+
+st.set_page_config(page_title="Sleeper League Batch", layout="wide")
+league_batch_tab()
@@ -1,16 +1,20 @@
 import streamlit as st
 import datetime
-from sleeper_wrapper import League, Players
 import pandas as pd
-import requests
 import difflib
 import pytz
 
-from plotly import graph_objects as go
-import plotly.express as px
-from plotly.subplots import make_subplots
-
-from scraper.ktc_to_csv import scrape_ktc
+from utils.ktc_index import value_undrafted_players
+from utils.draft_pick_ledger import build_pick_ledger
+from utils.sleeper_loaders import load_sleeper_page_data, get_season_matchups
+from utils.sleeper_shared_data import get_all_players, get_keeptradecut_dataframe, get_ktc_index, get_ktc_pick_values, get_season_team_games, get_players_with_keys
+from utils.league_batch import ROSTER_COLUMNS, get_draft_year, sorted_league_standings, value_league_rosters
+from utils.roster_value_history import record_snapshot, team_value_history, value_change_since
+from utils.playoff_odds import DEFAULT_SIMULATIONS, playoff_odds
+from utils.trade_finder import DEFAULT_VALUE_TOLERANCE, DEFAULT_NEED_WEIGHT, build_team_assets, position_strength, positional_need, find_trades
+from utils.nfl_schedule import games_in_weeks, NFL_REGULAR_SEASON_WEEKS
+from utils.game_timeline import players_in_games, build_game_summary, build_games_figure, build_impactful_games
+from utils.timing import span
 
 DEFAULT_TIMEZONE = "US/Eastern"
 
@@ -59,63 +63,212 @@ TEAM_COLOR_MAP = {
 
 pd.set_option('future.no_silent_downcasting', True)
 
-@st.cache_data(ttl=24 * 3600)  # Cache for 24 hours
-def get_all_players():
-    return Players().get_all_players()
-
-def get_player_info(player_id, all_players):
-    return all_players.get(player_id)
+@st.cache_data(ttl=3600)  # Cache for 1 hour per league roster state
+def get_undrafted_player_values(sleeper_league_id, drafted_player_ids, columns):
+    players_df, keys_df = get_players_with_keys()
+    return value_undrafted_players(players_df, drafted_player_ids, get_ktc_index(), list(columns), keys_df=keys_df)
 
-def get_player_value(row, keeptradecut_df, fuzzy_match=True):
-    # print(f"Getting value for player_id: {row['player_id']}, name: {row['search_first_name']} {row['search_last_name']}")
-    player_full_name = " ".join([row["search_first_name"], row["search_last_name"]])
-    player_last_name = row["search_last_name"]
-    player_first_name = row["search_first_name"]
-    player_team = row["team"]
+@st.cache_data(ttl=300)  # Cache for 5 minutes per league roster state
+def get_league_roster_values(sleeper_league_id, roster_state):
+    """Value every rostered player in the league with one KTC join
 
-    if player_team == "JAX":
-        player_team = "JAC"  # KTC uses JAC for Jacksonville
+    roster_state is a tuple of (owner_id, player_ids) pairs, so any add/drop/trade changes the cache key.
+    """
+    return value_league_rosters(roster_state, get_all_players(), get_ktc_index())
 
-    # Player Names are in the first column of keeptradecut_df, but the name of the column is unknown
-    ktc_name_column = keeptradecut_df.columns[0]
-    ktc_value_column = "SFValue"  # Assuming the column name is "Value"
-    ktc_team_column = "Team"
+def build_user_roster_data(users, league_roster_df, draft_order_df):
+    """Split the league-wide roster and pick frames into per-user data in one grouped pass"""
+    rosters_by_owner = dict(tuple(league_roster_df.groupby("owner_id", sort=False)))
+    picks_by_team = dict(tuple(draft_order_df.sort_values(by="KTC Value", ascending=False).groupby("owner_team_name", sort=False)))
 
-    # Clean up player names in keeptradecut_df by stripping periods
-    keeptradecut_df[ktc_name_column] = keeptradecut_df[ktc_name_column].str.replace('.', '', regex=False).str.strip()
+    user_roster_data = {}
+    for user in users:
+        team_name = user["metadata"]["team_name"]
+        player_df = rosters_by_owner.get(user["user_id"], league_roster_df.iloc[0:0]).drop(columns="owner_id").reset_index(drop=True)
+        team_picks = picks_by_team.get(team_name, draft_order_df.iloc[0:0])
+        picks_ktc_value = team_picks["KTC Value"].sum() if not team_picks.empty else 0
+
+        user_roster_data[user["display_name"]] = {
+            "team_name": team_name,
+            "roster": player_df,
+            "total_ktc_value": player_df["KTC Value"].sum() + picks_ktc_value,
+            "picks_ktc_value": picks_ktc_value,
+            "draft_picks": team_picks
+        }
+    return user_roster_data
+
+@st.fragment
+def roster_details_fragment(users, user_roster_data):
+    # Only the selected team is rendered, and picking another team reruns just this fragment
+    team_labels = {user["display_name"]: user["metadata"]["team_name"] + " - " + user["display_name"] for user in users}
+    display_name = st.selectbox("Select Team:", options=list(user_roster_data.keys()), format_func=lambda name: team_labels[name], key="roster_details_team")
+    data = user_roster_data[display_name]
+    player_df = data["roster"]
+
+    with st.expander("Full Player Data"):
+        all_players = get_all_players()
+        full_player_df = all_players[all_players.index.isin(player_df["player_id"])].reset_index()
+        # Sort columns alphabetically
+        full_player_df = full_player_df.reindex(sorted(full_player_df.columns), axis=1)
+        st.dataframe(full_player_df)
+
+    st.dataframe(player_df)
+
+    team_picks = data["draft_picks"]
+    st.subheader("Draft Picks")
+    if not team_picks.empty:
+        # Display only relevant columns for draft picks
+        picks_display_df = team_picks[["year", "round", "pick_in_round", "KTC Pick Name", "KTC Value", "is_traded"]].copy()
+        picks_display_df = picks_display_df.rename(columns={
+            "year": "Year",
+            "round": "Round", 
+            "pick_in_round": "Pick #",
+            "KTC Pick Name": "Pick Name",
+            "KTC Value": "KTC Value",
+            "is_traded": "Traded"
+        })
+        st.dataframe(picks_display_df)
+    else:
+        st.write("No draft picks found for this team")
+
+    st.write(f"Total Player KTC Value: {player_df['KTC Value'].sum()}")
+    st.write(f"Total Draft Picks KTC Value: {data['picks_ktc_value']}")
+    st.write(f"**Total KTC Value for {display_name}: {data['total_ktc_value']}**")
+
+def roster_chart_signature(roster):
+    """Everything the roster charts show, per player, as a hashable cache key (the frame itself holds unhashable arrays)"""
+    chart_df = roster[["player_id", "search_last_name", "team", "KTC Value"]].assign(position=roster["fantasy_positions"].str[0])
+    return tuple(chart_df.astype(str).itertuples(index=False, name=None))
+
+@st.cache_data(ttl=300)  # Cache for 5 minutes, keyed on the charted values so value or position changes redraw
+def build_roster_sunbursts(user, roster_signature, _roster):
+    import plotly.express as px
+
+    roster = _roster.copy()
+
+    # Create a sunburst chart (stacked pie) with inner layer as position, outer as player
+    # Use the first fantasy position listed for each player
+    # fantasy_positions is read back from the players store as arrays, so index with .str instead of checking for lists
+    roster["fantasy_positions"] = roster["fantasy_positions"].str[0].fillna("N/A")
+    position_fig = px.sunburst(
+        roster,
+        path=["fantasy_positions", "search_last_name"],
+        values="KTC Value",
+        title=f"KTC Value Distribution for {user} (Position → Player)"
+    )
 
-    # Check for rows that contain the player's last name (case insensitive)
-    matched_row = keeptradecut_df[keeptradecut_df[ktc_name_column].str.contains(player_last_name, case=False, na=False)]
+    # Add percentage to labels
+    position_fig.update_traces(textinfo="label+percent entry", hovertemplate='%{label}<br>KTC Value: %{value}<br>Percentage of Total: %{percentParent:.2%}<extra></extra>')
+    position_fig.update_layout(margin=dict(t=40, l=0, r=0, b=0))
+
+    # Create a sunburst chart (stacked pie) with inner layer as team, outer as player
+    roster["team"] = roster["team"].fillna("N/A")
+    team_fig = px.sunburst(
+        roster,
+        path=["team", "search_last_name"],
+        values="KTC Value",
+        title=f"KTC Value Distribution for {user} (Team → Player)",
+        color="team",
+        color_discrete_map=TEAM_COLOR_MAP
+    )
 
-    # Further filter by first name
-    matched_row = matched_row[matched_row[ktc_name_column].str.contains(player_first_name, case=False, na=False)]
+    # Add percentage to labels
+    team_fig.update_traces(textinfo="label+percent entry", hovertemplate='%{label}<br>KTC Value: %{value}<br>Percentage of Total: %{percentParent:.2%}<extra></extra>')
+    team_fig.update_layout(margin=dict(t=40, l=0, r=0, b=0))
 
-    # Check to make sure the player's first name comes before the last name in the matched rows
-    matched_row = matched_row[matched_row[ktc_name_column].str.lower().str.index(player_first_name.lower()) < matched_row[ktc_name_column].str.lower().str.index(player_last_name.lower())]
+    return position_fig, team_fig
 
-    # Check that the team matches using the ktc_team_column
-    # The ktc data uses three letter team abbreviations, but sleeper uses two or three letter abbreviations, depending on the team
-    # For example, "New England Patriots" is "NE" in sleeper but "NEP" in ktc
-    # If the player's team is None, skip this filtering step
-    if player_team:
-        matched_row = matched_row[matched_row[ktc_team_column].str.contains(player_team, case=False, na=False)]
+@st.fragment
+def roster_charts_fragment(user_roster_data):
+    # Charts are only built for the selected team, and cached per roster
+    user = st.selectbox("Select Team to Chart:", options=list(user_roster_data.keys()), key="roster_charts_team")
+    roster = user_roster_data[user]["roster"]
+    if roster.empty:
+        st.write("No players in roster")
+        return
 
-    # Return the value
-    if not matched_row.empty:
-        if not matched_row.empty:
-            return matched_row[ktc_value_column].values[0]
-        else:
-            return None
+    position_fig, team_fig = build_roster_sunbursts(user, roster_chart_signature(roster), roster)
+    cols = st.columns(2)
+    with cols[0]:
+        st.plotly_chart(position_fig, use_container_width=True)
+    with cols[1]:
+        st.plotly_chart(team_fig, use_container_width=True)
+    with st.expander("Roster Data"):
+        st.dataframe(roster)
+
+@st.fragment
+def roster_value_history_fragment(sleeper_league_id):
+    import plotly.express as px
+
+    history_df = team_value_history(sleeper_league_id)
+    if history_df.empty or len(history_df) < 2:
+        st.write("Team values are recorded once a day when this page is loaded. Come back tomorrow to see how they change.")
+        return
+
+    fig = px.line(history_df, labels={"index": "Date", "value": "Total KTC Value", "variable": "Team"}, title="Total KTC Value Over Time", line_shape="hv")
+    st.plotly_chart(fig, use_container_width=True)
 
-@st.cache_data(ttl=24 * 3600)  # Cache for 24 hours
-def get_keeptradecut_dataframe():
-    ktc_data = scrape_ktc()
-    df = pd.DataFrame(ktc_data)
+    since_date = st.date_input("Show Value Change Since:", value=history_df.index.min().date(), min_value=history_df.index.min().date(), max_value=history_df.index.max().date(), key="value_history_since")
+    st.dataframe(value_change_since(sleeper_league_id, since_date), hide_index=True)
+
+@st.cache_data(ttl=300)  # Cache for 5 minutes, matchups update as games are played
+def get_playoff_odds(sleeper_league_id, current_week, simulations, processes, _rosters, _users, _league):
+    settings = _league.get("settings") or {}
+    last_regular_season_week = settings.get("playoff_week_start", 15) - 1
+    matchups_by_week = get_season_matchups(sleeper_league_id, last_regular_season_week)
+    team_names = {user["user_id"]: user["metadata"]["team_name"] for user in _users}
+    return playoff_odds(_rosters, team_names, matchups_by_week, current_week, last_regular_season_week, settings.get("playoff_teams", 6), simulations=simulations, processes=processes)
+
+@st.fragment
+def playoff_odds_fragment(sleeper_league_id, league_data):
+    st.write("Plays out the rest of the regular season many times, drawing each team's weekly scores from its scores so far. Divisions are not considered, teams are seeded by wins, then points for.")
+    cols = st.columns(2)
+    with cols[0]:
+        simulations = st.number_input("Simulations:", min_value=1000, max_value=200000, value=DEFAULT_SIMULATIONS, step=10000)
+    with cols[1]:
+        processes = st.number_input("Worker Processes:", min_value=1, max_value=8, value=1, help="Split the simulations across processes, worthwhile for very large runs")
+
+    # The simulation and the matchup fetch for every week only run on request, not on every page load
+    if not st.toggle("Run playoff simulation", value=False, key="playoff_odds_run"):
+        return
+
+    nfl_state = league_data["nfl_state"]
+    current_week = nfl_state.get("week") if nfl_state and nfl_state.get("week") else 1
+    odds_df = get_playoff_odds(sleeper_league_id, current_week, int(simulations), int(processes), league_data["rosters"], league_data["users"], league_data["league"])
+    percent_columns = [column for column in odds_df.columns if column.endswith("%")]
+    st.dataframe(odds_df.style.format({column: "{:.1%}" for column in percent_columns}), hide_index=True)
+
+@st.fragment
+def trade_finder_fragment(users, league_roster_df, draft_order_df):
+    st.header("Trade Finder")
+    user_by_display_name = {user["display_name"]: user for user in users}
+    team_names = {user["user_id"]: user["metadata"]["team_name"] for user in users}
 
-    return df
+    cols = st.columns(3)
+    with cols[0]:
+        display_name = st.selectbox("Find Trades For:", options=list(user_by_display_name.keys()), key="trade_finder_team")
+    with cols[1]:
+        tolerance = st.slider("KTC Value Tolerance:", min_value=0.05, max_value=0.5, value=DEFAULT_VALUE_TOLERANCE, step=0.05, help="How far apart the two sides of a trade can be, as a fraction of their KTC value")
+    with cols[2]:
+        need_weight = st.slider("Positional Need Weight:", min_value=0.0, max_value=1.0, value=DEFAULT_NEED_WEIGHT, step=0.1, help="How much more a player at a position you are short at is worth to you")
+
+    # Value arrays for every team's players and picks, built once per search
+    player_names = get_all_players()["full_name"]
+    assets_df = build_team_assets(league_roster_df, draft_order_df, player_names)
+    my_owner_id = user_by_display_name[display_name]["user_id"]
+
+    need = positional_need(position_strength(assets_df), my_owner_id)
+    st.write("Positional need (0 = at or above league average starters, 1 = no starters): " + ", ".join(f"{position} {value:.2f}" for position, value in need.items()))
+
+    trades_df = find_trades(assets_df, my_owner_id, team_names, tolerance=tolerance, need_weight=need_weight)
+    if trades_df.empty:
+        st.write("No trades found within the KTC value tolerance.")
+    else:
+        st.dataframe(trades_df, hide_index=True)
 
 def sleeper_integration_tab():
-    keeptradecut_df = get_keeptradecut_dataframe()
+    with span("sleeper.ktc_data"):
+        keeptradecut_df = get_keeptradecut_dataframe()
 
     st.header("Sleeper Integration")
     
@@ -126,221 +279,59 @@ def sleeper_integration_tab():
     with st.expander("KeepTradeCut Data"):
         st.dataframe(keeptradecut_df)
     
-    league = League(sleeper_league_id)
-    users = league.get_users()
-    rosters = league.get_rosters()
+    now_in_default_tz = convert_to_default_timezone(datetime.datetime.now(datetime.timezone.utc))
+    current_year = now_in_default_tz.year
 
-    all_players = get_all_players()
+    # Users, rosters, traded picks, NFL state and the ESPN schedule are independent, so they are fetched concurrently
+    with span("sleeper.league_data"):
+        league_data = load_sleeper_page_data(sleeper_league_id)
+    users = league_data["users"]
+    rosters = league_data["rosters"]
 
     user_count = len(users)
     st.write(f"Number of users in the league: {user_count}")
 
     # Get standings and traded picks data first (needed for draft picks calculation)
-    traded_picks = league.get_traded_picks()
-    standings = league.get_standings(rosters, users)
-
-    for i in range(len(standings)):
-        standings[i] = list(standings[i])
-        standings[i][3] = float(standings[i][3])  # Points For
-        standings[i] = tuple(standings[i])
-
-    # standings: List of tuples (team_name, wins, losses, points_for, ...)
-    sorted_standings = sorted(
-        standings,
-        key=lambda x: (x[1], x[3]),  # x[1]=wins, x[3]=points_for
-        reverse=True
-    )
+    traded_picks = league_data["traded_picks"]
+    sorted_standings = sorted_league_standings(rosters, users)
 
     st.header("Overall League Standings")
     standings_df = pd.DataFrame(sorted_standings, columns=["Team Name", "Wins", "Losses", "Points For"])
     st.dataframe(standings_df)
 
+    with st.expander("Playoff Odds"), span("sleeper.playoff_odds"):
+        playoff_odds_fragment(sleeper_league_id, league_data)
+
     default_user = "sclebow"
 
     # Reorder users to have the default user first
     users = sorted(users, key=lambda x: x["display_name"] != default_user)
 
     # Calculate draft picks for all teams (needed for roster tabs)
-    now_in_default_tz = convert_to_default_timezone(datetime.datetime.now(datetime.timezone.utc))
-    current_year = now_in_default_tz.year
-    if now_in_default_tz.month < 4:
-        draft_year = current_year
-    else:
-        draft_year = current_year + 1
-
-    draft_order = []
-    for year in range(draft_year, draft_year + 4):
-        for round_num in range(1, 6):
-            for team in sorted_standings[::-1]:  # Reverse order of standings
-                team_name = team[0]
-                draft_order.append({
-                    "year": year,
-                    "round": round_num,
-                    "pick_in_round": sorted_standings[::-1].index(team) + 1,
-                    "overall_pick": (round_num - 1) * len(users) + sorted_standings[::-1].index(team) + 1,
-                    "owner_team_name": team_name,
-                    "previous_owner_team_name": None,
-                    "owner_id": next((u["user_id"] for u in users if u["metadata"]["team_name"] == team_name), None),
-                    "previous_owner_id": next((u["user_id"] for u in users if u["metadata"]["team_name"] == team_name), None),
-                    "is_traded": False
-                })
-    draft_order_df = pd.DataFrame(draft_order)
-
-    # Mark traded picks
-    for pick in traded_picks:
-        round_num = pick["round"]
-        owner_id = pick["owner_id"]
-        previous_owner_id = pick["previous_owner_id"]
-
-        # Find the corresponding roster in rosters
-        owner_roster = next((r for r in rosters if r["roster_id"] == owner_id))
-        owner_id = owner_roster["owner_id"]
-        previous_owner_roster = next((r for r in rosters if r["roster_id"] == previous_owner_id))
-        previous_owner_id = previous_owner_roster["owner_id"]
-
-        # Find the pick in draft_order_df and update it
-        pick_index = draft_order_df[(draft_order_df["round"] == round_num) & (draft_order_df["owner_id"] == previous_owner_id)].index
-        if not pick_index.empty:
-            draft_order_df.at[pick_index[0], "owner_id"] = owner_id
-            draft_order_df.at[pick_index[0], "owner_team_name"] = next((u["metadata"]["team_name"] for u in users if u["user_id"] == owner_id), None)
-            draft_order_df.at[pick_index[0], "previous_owner_id"] = previous_owner_id
-            draft_order_df.at[pick_index[0], "previous_owner_team_name"] = next((u["metadata"]["team_name"] for u in users if u["user_id"] == previous_owner_id), None)
-            draft_order_df.at[pick_index[0], "is_traded"] = True
-
-    # Add pick position and KTC names to draft picks
-    draft_order_df["pick_position"] = draft_order_df.apply(lambda row:
-        "Early" if row["pick_in_round"] <= (len(users) * 0.25) else
-        ("Late" if row["pick_in_round"] > (len(users) * 0.75) else "Mid"), axis=1)
-    
-    def get_ordinal_suffix(n):
-        if 10 <= n % 100 <= 20:
-            suffix = "th"
-        else:
-            suffix = {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
-        return suffix
-
-    draft_order_df["KTC Pick Name"] = draft_order_df.apply(
-        lambda row: f"{row['year']} {row['pick_position']} {row['round']}{get_ordinal_suffix(row['round'])}", 
-        axis=1
-    )
-
-    # Look up the pick values directly in the KTC dataframe
-    name_column = keeptradecut_df.columns[0]  # First column contains player/pick names
-    value_column = "SFValue"  # Assuming the column name for values
-    
-    # Create a function to find pick values
-    def find_pick_value(pick_name):
-        # Look for exact match in the keeptradecut dataframe
-        matched_row = keeptradecut_df[keeptradecut_df[name_column] == pick_name]
-        if not matched_row.empty:
-            return matched_row[value_column].values[0]
-        return 0
-    
-    # Apply the function to get KTC values for picks
-    draft_order_df["KTC Value"] = draft_order_df["KTC Pick Name"].apply(find_pick_value)
-    draft_order_df["KTC Value"] = draft_order_df["KTC Value"].fillna(0)
+    draft_year = get_draft_year(now_in_default_tz)
 
-    with st.expander("League Users and Rosters"):
-        tabs = st.tabs([(user["metadata"]["team_name"] + " - " + user["display_name"]) for user in users])
+    # Build all years x rounds x teams at once, apply trades through roster/user id maps and value picks by name
+    with span("sleeper.pick_ledger"):
+        draft_order_df = build_pick_ledger(sorted_standings, users, rosters, traded_picks, draft_year, get_ktc_pick_values())
 
-    user_roster_data = {}
+    # Value every roster in the league with one join, cached per league roster state
+    roster_state = tuple((roster["owner_id"], tuple(roster["players"] or [])) for roster in rosters)
+    with span("sleeper.roster_values"):
+        league_roster_df = get_league_roster_values(sleeper_league_id, roster_state)
+        user_roster_data = build_user_roster_data(users, league_roster_df, draft_order_df)
 
-    for i, user in enumerate(users):
-        user_id = user["user_id"]
-        with tabs[i]:
-            # print(user_id)
-            roster = next((r for r in rosters if r["owner_id"] == user_id), None)
-            # print("Roster attributes:", roster.keys() if roster else "No roster found")
-            players = roster["players"]
-            reserve = roster["reserve"]
-            starters = roster["starters"]
-            taxi = roster["taxi"]
-
-            if not players:
-                players = []
-            if not reserve:
-                reserve = []
-            if not starters:
-                starters = []
-            if not taxi:
-                taxi = []
-
-            # print("Players:", players)
-            # print("Reserve:", reserve)
-            # print("Starters:", starters)
-            # print("Taxi:", taxi)
-
-            player_ids = list(players)
-
-            player_dicts = []
-            for player_id in player_ids:
-                player_info = all_players.get(player_id)
-                player_dicts.append(player_info)
-
-            player_df = pd.DataFrame(player_dicts)
-
-            with st.expander("Full Player Data"):
-                # Sort columns alphabetically
-                player_df = player_df.reindex(sorted(player_df.columns), axis=1)
-                st.dataframe(player_df)
-
-            columns_to_keep = ["player_id", "search_first_name", "search_last_name", "fantasy_positions", "team", "number", "age", "years_exp", "depth_chart_order"]
-            player_df = player_df[columns_to_keep]
-
-            # Get "KTC Value" column from keeptradecut_df
-            player_df["KTC Value"] = player_df.apply(lambda row: get_player_value(row, keeptradecut_df), axis=1)
-
-            # Replace NaN values in "KTC Value" column with 0
-            player_df["KTC Value"] = player_df["KTC Value"].fillna(0)
-
-            # Sort by KTC Value descending
-            player_df = player_df.sort_values(by="KTC Value", ascending=False)
-
-            st.dataframe(player_df)
-
-            # Get draft picks for this team
-            team_name = user["metadata"]["team_name"]
-            team_picks = draft_order_df[draft_order_df["owner_team_name"] == team_name].copy()
-            team_picks = team_picks.sort_values(by="KTC Value", ascending=False)
-            
-            st.subheader("Draft Picks")
-            if not team_picks.empty:
-                # Display only relevant columns for draft picks
-                picks_display_df = team_picks[["year", "round", "pick_in_round", "KTC Pick Name", "KTC Value", "is_traded"]].copy()
-                picks_display_df = picks_display_df.rename(columns={
-                    "year": "Year",
-                    "round": "Round", 
-                    "pick_in_round": "Pick #",
-                    "KTC Pick Name": "Pick Name",
-                    "KTC Value": "KTC Value",
-                    "is_traded": "Traded"
-                })
-                st.dataframe(picks_display_df)
-                picks_ktc_value = team_picks["KTC Value"].sum()
-            else:
-                st.write("No draft picks found for this team")
-                picks_ktc_value = 0
-
-            total_ktc_value = player_df["KTC Value"].sum() + picks_ktc_value
-            st.write(f"Total Player KTC Value: {player_df['KTC Value'].sum()}")
-            st.write(f"Total Draft Picks KTC Value: {picks_ktc_value}")
-            st.write(f"**Total KTC Value for {user['display_name']}: {total_ktc_value}**")
-
-            user_roster_data[user["display_name"]] = {
-                "team_name": user["metadata"]["team_name"],
-                "roster": player_df,
-                "total_ktc_value": total_ktc_value,
-                "picks_ktc_value": picks_ktc_value,
-                "draft_picks": team_picks
-            }
+    with st.expander("League Users and Rosters"):
+        roster_details_fragment(users, user_roster_data)
 
     # Compare rosters
     st.header("Roster Comparison")
     comparison_rows = []
+    user_ids = {user["display_name"]: user["user_id"] for user in users}
     for user, data in user_roster_data.items():
         player_ktc_value = data["roster"]["KTC Value"].sum()
         picks_ktc_value = data.get("picks_ktc_value", 0)
         comparison_rows.append({
+            "Owner ID": user_ids[user],
             "User": user,
             "Team Name": data["team_name"],
             "Player KTC Value": player_ktc_value,
@@ -355,65 +346,31 @@ def sleeper_integration_tab():
     comparison_df = comparison_df.sort_values(by="Total KTC Value", ascending=False)
 
     # Create a stacked bar chart using plotly, that shows total KTC value for each user, with player value and draft pick value as different colors
-    fig = go.Figure(data=[
-        go.Bar(name="Player KTC Value", x=comparison_df["User"], y=comparison_df["Player KTC Value"]),
-        go.Bar(name="Draft Picks KTC Value", x=comparison_df["User"], y=comparison_df["Draft Picks KTC Value"])
-    ])
-    fig.update_layout(barmode='stack', title="Roster Comparison", yaxis_title="KeepTradeCut Total Roster Value")
-
-    st.plotly_chart(fig, use_container_width=True)
+    with span("plotly.roster_comparison"):
+        from plotly import graph_objects as go
+        fig = go.Figure(data=[
+            go.Bar(name="Player KTC Value", x=comparison_df["User"], y=comparison_df["Player KTC Value"]),
+            go.Bar(name="Draft Picks KTC Value", x=comparison_df["User"], y=comparison_df["Draft Picks KTC Value"])
+        ])
+        fig.update_layout(barmode='stack', title="Roster Comparison", yaxis_title="KeepTradeCut Total Roster Value")
+
+        st.plotly_chart(fig, use_container_width=True)
     with st.expander("Comparison Data"):
         st.dataframe(comparison_df)
 
-    # Create a pie chart showing the distribution of KTC value per player for all teams
-    tabs = st.tabs([user for user in user_roster_data.keys()])
-    for i, user in enumerate(user_roster_data.keys()):
-        with tabs[i]:
-            data = user_roster_data[user]
-            roster = data["roster"]
-            if roster.empty:
-                st.write("No players in roster")
-                continue
-
-            cols = st.columns(2)
-            with cols[0]:
-                # Create a sunburst chart (stacked pie) with inner layer as position, outer as player
-                # Use the first fantasy position listed for each player
-                roster["fantasy_positions"] = roster["fantasy_positions"].apply(lambda x: x[0] if isinstance(x, list) and len(x) > 0 else "N/A")
-                fig = px.sunburst(
-                    roster,
-                    path=["fantasy_positions", "search_last_name"],
-                    values="KTC Value",
-                    title=f"KTC Value Distribution for {user} (Position → Player)"
-                )
-
-                # Add percentage to labels
-                total_value = roster["KTC Value"].sum()
-                fig.update_traces(textinfo="label+percent entry", hovertemplate='%{label}<br>KTC Value: %{value}<br>Percentage of Total: %{percentParent:.2%}<extra></extra>')                
-
-                fig.update_layout(margin=dict(t=40, l=0, r=0, b=0))
-
-                st.plotly_chart(fig, use_container_width=True)
-            with cols[1]:
-                # Create a sunburst chart (stacked pie) with inner layer as team, outer as player
-                roster["team"] = roster["team"].fillna("N/A")
-                fig = px.sunburst(
-                    roster,
-                    path=["team", "search_last_name"],
-                    values="KTC Value",
-                    title=f"KTC Value Distribution for {user} (Team → Player)",
-                    color="team",
-                    color_discrete_map=TEAM_COLOR_MAP
-                )
-
-                # Add percentage to labels
-                total_value = roster["KTC Value"].sum()
-                fig.update_traces(textinfo="label+percent entry", hovertemplate='%{label}<br>KTC Value: %{value}<br>Percentage of Total: %{percentParent:.2%}<extra></extra>')
-                fig.update_layout(margin=dict(t=40, l=0, r=0, b=0))
-
-                st.plotly_chart(fig, use_container_width=True)
-            with st.expander("Roster Data"):
-                st.dataframe(roster)
+    # Keep a daily history of every team's value, only teams whose value changed are written
+    with span("sleeper.record_snapshot"):
+        record_snapshot(sleeper_league_id, comparison_df, now_in_default_tz.date())
+    with st.expander("Roster Value History"), span("sleeper.value_history"):
+        roster_value_history_fragment(sleeper_league_id)
+
+    # Search trades between the selected team and every other roster, in its own fragment
+    with span("sleeper.trade_finder"):
+        trade_finder_fragment(users, league_roster_df, draft_order_df)
+
+    # Create a pie chart showing the distribution of KTC value per player for the selected team
+    with span("plotly.roster_charts"):
+        roster_charts_fragment(user_roster_data)
 
     # Find highest value KTC players that are not on any roster
     all_drafted_player_ids = []
@@ -421,45 +378,30 @@ def sleeper_integration_tab():
         all_drafted_player_ids.extend(data["roster"]["player_id"].tolist())
     all_drafted_player_ids = set(all_drafted_player_ids)
 
-    all_player_ids = set(all_players.keys())
-    undrafted_player_ids = all_player_ids - all_drafted_player_ids
-
-    undrafted_player_dicts = []
-    for player_id in undrafted_player_ids:
-        player_info = all_players.get(player_id)
-        undrafted_player_dicts.append(player_info)
-    undrafted_player_df = pd.DataFrame(undrafted_player_dicts)
-    undrafted_player_df = undrafted_player_df[columns_to_keep]
-
-    # Drop rows with missing first or last name
-    undrafted_player_df = undrafted_player_df.dropna(subset=["search_first_name", "search_last_name"])
-
-    # Drop rows where team is None
-    undrafted_player_df.dropna(subset=["team"], inplace=True)
-
-    # Drop rows where depth_chart_order is NaN
-    undrafted_player_df.dropna(subset=["depth_chart_order"], inplace=True)
-
-    undrafted_player_df["KTC Value"] = undrafted_player_df.apply(lambda row: get_player_value(row, keeptradecut_df, fuzzy_match=False), axis=1)
-    undrafted_player_df["KTC Value"] = undrafted_player_df["KTC Value"].fillna(0)
-    undrafted_player_df = undrafted_player_df.sort_values(by="KTC Value", ascending=False)
+    # Cached per league roster state, so reruns that do not change any roster skip the join entirely
+    with span("sleeper.undrafted_players"):
+        undrafted_player_df = get_undrafted_player_values(sleeper_league_id, tuple(sorted(all_drafted_player_ids)), tuple(ROSTER_COLUMNS))
 
     st.header("Top Undrafted Players by KTC Value")
     st.dataframe(undrafted_player_df.head(20))
     with st.expander("All Undrafted Players"):
         st.dataframe(undrafted_player_df)
 
+    # The calendar runs in its own fragment, so changing its team selectbox does not recompute the rosters
+    with span("sleeper.upcoming_games"):
+        upcoming_games_fragment(users, user_roster_data, league_data, current_year)
+
+@st.fragment
+def upcoming_games_fragment(users, user_roster_data, league_data, current_year):
     # Create a calendar of upcoming NFL games with your players highlighted
     st.header("Upcoming NFL Games Calendar with Your Players")
     user_keys = list(user_roster_data.keys())
     selected_team_display_name = st.selectbox("Select Team to Show Players From:", options=user_keys, index=0)
     selected_team = next((user for user in users if user["display_name"] == selected_team_display_name), None)
 
-    # Get week from Sleeper NFL State endpoint
-    url = "https://api.sleeper.app/v1/state/nfl"
-    response = requests.get(url)
-    if response.status_code == 200:
-        nfl_state = response.json()
+    # Week from the Sleeper NFL State endpoint, loaded with the rest of the page data
+    nfl_state = league_data["nfl_state"]
+    if nfl_state and nfl_state.get("week"):
         week = nfl_state.get("week")
     else:
         week = 1  # Default fallback
@@ -467,227 +409,52 @@ def sleeper_integration_tab():
 
     st.write(f"Current NFL Week: {week}")
 
-    # Use espn api to get NFL schedule for the week
-    @st.cache_data(ttl=24 * 3600)  # Cache for 24 hours
-    def get_nfl_schedule(current_year, week):
-        url = f"https://cdn.espn.com/core/nfl/schedule?xhr=1&year={current_year}&week={week}"
-        resp = requests.get(url)
-        if resp.status_code == 200:
-            data = resp.json()
-            return data
-        else: return None
-    schedule_data = get_nfl_schedule(current_year, week)
-    schedule_data = schedule_data["content"]["schedule"]
-
-    player_week_dict = {}
-
-    for date_string in schedule_data.keys():
-        games = schedule_data[date_string]["games"]
+    # Pick one week or a range, the whole season is already indexed by (week, team)
+    first_week, last_week = st.slider("Weeks to Show:", min_value=1, max_value=NFL_REGULAR_SEASON_WEEKS, value=(min(week, NFL_REGULAR_SEASON_WEEKS), min(week, NFL_REGULAR_SEASON_WEEKS)))
+
+    week_range_label = f"week {first_week}" if first_week == last_week else f"weeks {first_week}-{last_week}"
+
+    team_game_table, unparsed_short_names = get_season_team_games(current_year, DEFAULT_TIMEZONE)
+    for short_name in unparsed_short_names:
+        st.warning(f"Could not parse game short name: {short_name}")
+
+    week_team_games_df = games_in_weeks(team_game_table, first_week, last_week)
+    week_games_df = week_team_games_df.drop_duplicates(subset=["week", "game"]).sort_values(by=["week", "game_time"])
+
+    selected_team_roster = user_roster_data[selected_team["display_name"]]["roster"]
+    timeline_df = players_in_games(selected_team_roster, week_team_games_df)
+    players_by_game = {game: players[selected_team_roster.columns] for game, players in timeline_df.groupby(["week", "game"], sort=False)}
+
+    for date_string, date_games_df in week_games_df.groupby("date_string", sort=False):
         date = datetime.datetime.strptime(date_string, "%Y%m%d").date()
         st.subheader(f"Games for {date.strftime('%A, %B %d, %Y')}")
-        data = schedule_data[date_string]
-        games_df = pd.DataFrame(games)
-
-        for game in games:
-            short_name = game["shortName"]
-            if "@" in short_name:
-                try:
-                    away_team, home_team = short_name.split(" @ ")
-                except ValueError:
-                    st.warning(f"Could not parse game short name: {short_name}")
-            elif "VS" in short_name:
-                try:
-                    home_team, away_team = short_name.split(" VS ")
-                except ValueError:
-                    st.warning(f"Could not parse game short name: {short_name}")
-            elif "vs" in short_name:
-                try:
-                    home_team, away_team = short_name.split(" vs ")
-                except ValueError:
-                    st.warning(f"Could not parse game short name: {short_name}")
-            elif "At" in short_name:
-                try:
-                    away_team, home_team = short_name.split(" At ")
-                except ValueError:
-                    st.warning(f"Could not parse game short name: {short_name}")
-            elif "at" in short_name:
-                try:
-                    away_team, home_team = short_name.split(" at ")
-                except ValueError:
-                    st.warning(f"Could not parse game short name: {short_name}")
-            else:
-                st.warning(f"Could not parse game short name: {short_name}")
-                continue
-            
-            # Show players from selected team that are on either the away or home team
-            selected_team_roster = user_roster_data[selected_team["display_name"]]["roster"]
-            players_in_game = selected_team_roster[(selected_team_roster["team"] == away_team) | (selected_team_roster["team"] == home_team)]
-            if not players_in_game.empty:
-                state = game["status"]["type"]["state"]
-                if state == "pre":
-                    status = "Scheduled"
-                elif state == "in":
-                    status = "In Progress"
-                elif state == "post":
-                    status = "Final"
-                else:
-                    status = state.capitalize()
-
-                start_time = game["date"]
-                start_time = datetime.datetime.fromisoformat(start_time.replace("Z", "+00:00"))
-                
-                # Convert start_time to default timezone
-                start_time = convert_to_default_timezone(start_time)
-                st.write(f"**{away_team} at {home_team}** - {status} - Start Time: {start_time.strftime('%I:%M %p %Z')}")
+
+        for game in date_games_df.itertuples(index=False):
+            players_in_game = players_by_game.get((game.week, game.game))
+            if players_in_game is not None:
+                st.write(f"**{game.game}** - {game.status} - Start Time: {game.game_time.strftime('%I:%M %p %Z')}")
 
                 st.write(f"Players from {selected_team['metadata']['team_name']} in this game:")
-                st.dataframe(players_in_game)
-
-                if start_time not in player_week_dict:
-                    player_week_dict[start_time] = {}
-                player_week_dict[start_time][f"{away_team} at {home_team}"] = {
-                    "status": status,
-                    "players": players_in_game
-                }
+                st.dataframe(players_in_game.reset_index(drop=True))
             else:
                 st.write(f"No players from {selected_team['metadata']['team_name']} in this game.")
 
-    if not player_week_dict:
-        st.write(f"No players from {selected_team['metadata']['team_name']} found in any games for week {week}.")
+    if timeline_df.empty:
+        st.write(f"No players from {selected_team['metadata']['team_name']} found in any games for {week_range_label}.")
 
     else:
-        # Using plotly to create a timeline of games with your players highlighted
-        # Y-axis is the time of day, X-axis is the day of the week
-        timeline_data = []
-        for game_time, game_info in player_week_dict.items():
-            for game, details in game_info.items():
-                for player in details["players"].to_dict(orient="records"):
-                    timeline_data.append({
-                        "player_full_name": " ".join([player["search_first_name"], player["search_last_name"]]),
-                        "game": game,
-                        "date": game_time.date(),
-                        "time_of_day": game_time.time(),
-                        "home_team": game.split(" at ")[1],
-                        "away_team": game.split(" at ")[0],
-                        "game_time": game_time,
-                    })
-
-        if timeline_data:
-            timeline_df = pd.DataFrame(timeline_data)
-
-            # Create a game_df that counts the number of players in each game
-            game_df = timeline_df.groupby("game").agg(num_players=("player_full_name", "count")).reset_index()
-            game_df = game_df.merge(timeline_df[["game", "game_time", "date", "time_of_day", "home_team", "away_team"]].drop_duplicates(), on="game", how="left")
-            game_df = game_df.sort_values(by=["date", "time_of_day", "num_players"], ascending=[True, True, False])
-
-            # Bar widths for each datetime should be based on number of games at that datetime
-            game_counts = game_df["game_time"].value_counts().to_dict()
-            game_df["bar_width"] = game_df["game_time"].map(lambda x: 1.0 / game_counts[x])  # Base width of 0.2, plus a fraction based on number of games that day
-
-            # Count the number of games at each datetime
-            game_df["num_games_at_time"] = game_df["game_time"].map(lambda x: game_counts[x])
-
-            # Calculate the index of each game in each datetime group
-            game_df["game_index"] = game_df.groupby("game_time").cumcount()
-
-            game_df["game_time_str"] = game_df["game_time"].dt.strftime("%a %m/%d %I:%M %p")
-            
-            # Strip all whitespace from home_team and away_team names
-            game_df["home_team"] = game_df["home_team"].str.strip()
-            game_df["away_team"] = game_df["away_team"].str.strip()
-
-            # Create a color mapping for games based on home team
-            game_df["color"] = game_df["home_team"].map(TEAM_COLOR_MAP)
-            
-            # Create a grouped bar chart using plotly, that shows the number of players in each game
-            # Each bar is a datetime, with a bar for each game that day
-            fig = px.bar(
-                game_df,
-                x="game_time_str",
-                y="num_players",
-                color="home_team",
-                color_discrete_map=TEAM_COLOR_MAP,
-                title="Number of Players in Each Game",
-                labels={"num_players": "Number of Players", "date": "Date", "home_team": "Home Team"},
-                height=400
-            )
-            fig.update_layout(barmode="group")
-
-            # Show Time of Day on the x-axis labels
-            fig.update_xaxes(tickformat="%b %d\n%I:%M %p")
-
-            # Set the height of the figure based on the maximum number of players in any game
-            max_players = game_df["num_players"].max()
-            fig.update_layout(height=400 + max_players * 20)
-
-            for i, bar in enumerate(fig.data):
-                # Adjust the width of each bar based on the number of players in the game
-                bar.width = game_df.iloc[i]["bar_width"] * 0.8  # Scale down to 80% to give some space between bars
-                
-                # Adjust the bar_offset based on the game_index, so bars don't overlap
-                base_offset = -game_df.iloc[i]["bar_width"] / 2
-                index = game_df.iloc[i]["game_index"]
-                
-                # The bars are now centered on the x-axis value, so we need to offset them further based on their index and total number of games at that time
-                if game_df.iloc[i]["num_games_at_time"] > 1:
-                    additional_offset = (index - (game_df.iloc[i]["num_games_at_time"] - 1) / 2) * game_df.iloc[i]["bar_width"]
-
-                    bar.offset = base_offset + additional_offset
-                else:
-                    bar.offset = base_offset
-
-            # Add labels on top of each bar showing the name of the game
-            for i, bar in enumerate(fig.data):
-                bar.text = game_df.iloc[i]["game"]
-                bar.textposition = "outside"
-
-            # Add hover data to show the game name and list of players in the game
-            hover_texts = []
-            for i, row in game_df.iterrows():
-                players_in_game = timeline_df[timeline_df["game"] == row["game"]]["player_full_name"].tolist()
-                players_str = "<br>".join(players_in_game)
-                hover_text = f"<b>{row['game']}</b><br>Number of Players: {row['num_players']}<br><br><b>Players:</b><br>{players_str}"
-                hover_texts.append(hover_text)
-
-            # Set custom hover text for each bar
-            for i, bar in enumerate(fig.data):
-                bar.hovertemplate = hover_texts[i] + "<extra></extra>"
-
-            st.plotly_chart(fig)
-
-            with st.expander("Game Timeline Data"):
-                st.dataframe(game_df)
+        # Grouped bar chart of the week's games, one bar per game, offset within each kickoff time
+        game_df = build_game_summary(timeline_df, TEAM_COLOR_MAP)
+        st.plotly_chart(build_games_figure(game_df))
+
+        with st.expander("Game Timeline Data"):
+            st.dataframe(game_df.drop(columns=["players", "hover_text"]))
 
     # Determine which games are most impactful to the selected team, based on number of players in each game and KTC value of those players
     st.header(f"Most Impactful Games to {selected_team_display_name} This Week")
-    impactful_game_rows = []
-
-    for game_time, game_info in player_week_dict.items():
-        for game, details in game_info.items():
-            players = details["players"]
-            num_players = len(players)
-            total_ktc_value = players["KTC Value"].sum()
-            impactful_game_rows.append({
-                "game": game,
-                "date": game_time.date(),
-                "time_of_day": game_time.time(),
-                "status": details["status"],
-                "num_players": num_players,
-                "total_ktc_value": total_ktc_value,
-                "home_team": game.split(" at ")[1],
-                "away_team": game.split(" at ")[0],
-                "game_time": game_time
-            })
-
-    if impactful_game_rows:
-        impactful_game_df = pd.DataFrame(impactful_game_rows)
-        impactful_game_df = impactful_game_df.sort_values(by=["total_ktc_value", "num_players"], ascending=[False, False])
-        impactful_game_df["game_time_str"] = impactful_game_df["game_time"].dt.strftime("%a %m/%d %I:%M %p")
-
-        impactful_game_df["impact_score"] = impactful_game_df["total_ktc_value"] * 0.7 + impactful_game_df["num_players"] * 0.3 # Weighted score
-        impactful_game_df = impactful_game_df.sort_values(by="impact_score", ascending=False)
-
-        impactful_game_df = impactful_game_df.reset_index(drop=True)
+
+    if not timeline_df.empty:
+        impactful_game_df = build_impactful_games(game_df)
 
         dynamic_height = 35 * len(impactful_game_df) + 37  # 37 for header row 
         st.dataframe(impactful_game_df[["game", "date", "time_of_day", "status", "num_players", "total_ktc_value", "impact_score"]], height=min(dynamic_height, 600))
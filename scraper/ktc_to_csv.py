@@ -1,7 +1,5 @@
 import requests
 from bs4 import BeautifulSoup
-import gspread
-from oauth2client.service_account import ServiceAccountCredentials
 from tqdm import tqdm
 import sys,time,random
 from datetime import date, datetime
@@ -0,0 +1,22 @@
+from utils.draft_pick_ledger import build_pick_ledger
+from utils.sleeper_loaders import get_standings
+
+USERS = [
+    {"user_id": "u1", "display_name": "alice", "metadata": {"team_name": "Alice's Team"}},
+    {"user_id": "u2", "display_name": "bob", "metadata": {}},
+    {"user_id": "u3", "display_name": "carol", "metadata": None},
+]
+ROSTERS = [
+    {"roster_id": roster_id, "owner_id": user["user_id"], "settings": {"wins": wins, "losses": 3 - wins, "fpts": 100}}
+    for roster_id, user, wins in zip([1, 2, 3], USERS, [3, 2, 1])
+]
+
+def test_pick_ledger_owns_picks_of_users_without_a_team_name():
+    standings = sorted(get_standings(ROSTERS, USERS), key=lambda team: team[1], reverse=True)
+    traded_picks = [{"season": "2026", "round": 1, "roster_id": 3, "owner_id": 1, "previous_owner_id": 3}]
+
+    draft_order_df = build_pick_ledger(standings, USERS, ROSTERS, traded_picks, 2026, {}, years=1, rounds=2)
+
+    assert draft_order_df["owner_id"].notna().all()
+    assert draft_order_df["owner_id"].value_counts().to_dict() == {"u1": 3, "u2": 2, "u3": 1}
+    assert set(draft_order_df["owner_team_name"]) == {"Alice's Team", "bob", "carol"}
@@ -0,0 +1,29 @@
+from types import SimpleNamespace
+
+from utils.espn_free_agents import build_projection_matrix, rank_free_agents_by_window
+
+class FakeLeague:
+    def __init__(self):
+        self.requested_weeks = []
+
+    def free_agents(self, size, week):
+        self.requested_weeks.append(week)
+        return [SimpleNamespace(playerId=1, name="Player One", position="RB", proTeam="KC", projected_points=10.0 + week)]
+
+def test_build_projection_matrix_without_remaining_weeks():
+    league = FakeLeague()
+
+    player_info_df, projection_matrix = build_projection_matrix(league, 123, 2025, [])
+
+    assert league.requested_weeks == []
+    assert player_info_df.empty
+    assert list(player_info_df.columns) == ["name", "position", "proTeam"]
+    assert projection_matrix.empty
+    assert rank_free_agents_by_window(player_info_df, projection_matrix).empty
+
+def test_build_projection_matrix_pivots_weeks():
+    player_info_df, projection_matrix = build_projection_matrix(FakeLeague(), 456, 2025, [16, 17])
+
+    assert list(player_info_df.index) == [1]
+    assert list(projection_matrix.columns) == [16, 17]
+    assert projection_matrix.loc[1].tolist() == [26.0, 27.0]
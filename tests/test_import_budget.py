@@ -0,0 +1,14 @@
+from utils.import_budget import PAGE_IMPORT_BUDGETS, check_import_budgets, eagerly_imported_modules
+
+# Budgets are tight for cli.py import-budget, the test only catches a heavy import on a slow or busy machine
+IMPORT_BUDGET_TEST_SLACK = 5
+
+def test_pages_do_not_import_heavy_libraries_at_load():
+    assert eagerly_imported_modules() == []
+
+def test_page_imports_within_budget():
+    budgets = {page_path: budget * IMPORT_BUDGET_TEST_SLACK for page_path, budget in PAGE_IMPORT_BUDGETS.items()}
+
+    results, within_budget = check_import_budgets(budgets, repeats=1)
+
+    assert within_budget, [(page_path, seconds) for page_path, seconds, budget in results if seconds > budget]
@@ -0,0 +1,40 @@
+import pandas as pd
+
+from utils.ktc_index import build_ktc_index, sleeper_player_keys, value_undrafted_players
+
+COLUMNS = ["player_id", "full_name", "search_first_name", "search_last_name", "team", "depth_chart_order"]
+
+def players_frame(names):
+    return pd.DataFrame({
+        "player_id": [name.lower().replace(" ", "_") for name in names],
+        "full_name": names,
+        "search_first_name": [name.split()[0].lower() for name in names],
+        "search_last_name": [name.split()[1].lower() for name in names],
+        "team": "KC",
+        "depth_chart_order": 1.0,
+    }).set_index("player_id")
+
+def ktc_index():
+    return build_ktc_index(pd.DataFrame({
+        "Player Name": ["Alpha One", "Bravo Two", "Charlie Three"],
+        "Position": ["RB", "WR", "TE"],
+        "Team": ["KC", "KC", "KC"],
+        "SFValue": [3000, 2000, 1000],
+    }))
+
+def undrafted_names(players_df, keys_df):
+    undrafted_df = value_undrafted_players(players_df, {"alpha_one"}, ktc_index(), COLUMNS, keys_df=keys_df)
+    return undrafted_df["full_name"].tolist()
+
+def test_value_undrafted_players_with_keys_from_a_longer_store():
+    players_df = players_frame(["Alpha One", "Bravo Two", "Charlie Three", "Unranked Guy"])
+    stale_keys_df = sleeper_player_keys(players_frame(["Alpha One", "Bravo Two", "Charlie Three", "Unranked Guy", "Extra Player"]))
+
+    assert undrafted_names(players_df, stale_keys_df) == ["Bravo Two", "Charlie Three"]
+
+def test_value_undrafted_players_with_keys_shifted_by_a_refresh():
+    players_df = players_frame(["Alpha One", "Unranked Guy", "Bravo Two", "Charlie Three"])
+    # Same length, but built before "Unranked Guy" was added, so every row after it is shifted
+    shifted_keys_df = sleeper_player_keys(players_frame(["Alpha One", "Bravo Two", "Charlie Three", "Other Guy"]))
+
+    assert undrafted_names(players_df, shifted_keys_df) == ["Bravo Two", "Charlie Three"]
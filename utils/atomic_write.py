@@ -0,0 +1,18 @@
+import os
+import threading
+
+def atomic_write(path, write):
+    """Write path through write(temp_path), then move it into place in one step
+
+    Readers never see a half-written file. The temp name is unique per process and thread, so concurrent
+    writers never share one, and it is removed if the write fails.
+    """
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    temp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+    try:
+        write(temp_path)
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
@@ -0,0 +1,56 @@
+import sys
+import time
+import datetime
+import threading
+import traceback
+
+# Renews slow data (KTC scrape, Sleeper players, NFL schedule) before it expires, on a daemon thread in
+# each app process. The shared cache locks make sure only one process does each refresh, and readers keep
+# getting the last good copy until it is done, so no page ever waits on a scrape.
+
+REFRESH_CHECK_INTERVAL = 300  # Seconds between checks
+REFRESH_AHEAD_FRACTION = 0.8  # Renew data once it is this far through its max age
+
+def refresh_due(age, max_age):
+    """Missing data, or data close enough to its max age to renew now"""
+    return age is None or age >= max_age * REFRESH_AHEAD_FRACTION
+
+def run_refresh_cycle(tasks):
+    """Refresh every due task, returning the names of the ones that were refreshed
+
+    Each task is a dict with name, age (a function returning a timedelta or None), max_age (a timedelta)
+    and refresh (a function taking the age below which another process's refresh counts as done).
+    A failed refresh leaves the last good copy in place and is retried on the next cycle.
+    """
+    refreshed = []
+    for task in tasks:
+        if not refresh_due(task["age"](), task["max_age"]):
+            continue
+        try:
+            task["refresh"](task["max_age"] * REFRESH_AHEAD_FRACTION)
+            refreshed.append(task["name"])
+        except Exception:
+            print(f"Background refresh of {task['name']} failed:\n{traceback.format_exc()}", file=sys.stderr)
+    return refreshed
+
+def start_refresh_scheduler(get_tasks, interval=REFRESH_CHECK_INTERVAL):
+    """Start the refresh loop on a daemon thread; get_tasks is called every cycle so tasks can follow the date"""
+    def loop():
+        while True:
+            run_refresh_cycle(get_tasks())
+            time.sleep(interval)
+
+    thread = threading.Thread(target=loop, name="background-refresh", daemon=True)
+    thread.start()
+    return thread
+
+def format_age(age):
+    """Short human readable age like '5m', '3h 20m' or '2d 4h'"""
+    if age is None:
+        return "not loaded"
+    minutes = int(age / datetime.timedelta(minutes=1))
+    if minutes < 60:
+        return f"{minutes}m"
+    if minutes < 24 * 60:
+        return f"{minutes // 60}h {minutes % 60}m"
+    return f"{minutes // (24 * 60)}d {minutes // 60 % 24}h"
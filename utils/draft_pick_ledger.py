@@ -0,0 +1,83 @@
+import pandas as pd
+import numpy as np
+
+from utils.sleeper_loaders import user_team_name
+
+PICK_YEARS = 4
+PICK_ROUNDS = 5
+
+def get_ordinal_suffix(n):
+    if 10 <= n % 100 <= 20:
+        suffix = "th"
+    else:
+        suffix = {1: "st", 2: "nd", 3: "rd"}.get(n % 10, "th")
+    return suffix
+
+def build_pick_value_index(keeptradecut_df, value_column="SFValue"):
+    """Map KTC pick names ("2026 Early 1st") -> value, built once per scrape"""
+    # Pick names are in the first column of keeptradecut_df
+    name_column = keeptradecut_df.columns[0]
+    picks_df = keeptradecut_df[keeptradecut_df["Position"] == "PI"].drop_duplicates(subset=name_column, keep="first")
+    return dict(zip(picks_df[name_column], picks_df[value_column]))
+
+def build_pick_ledger(sorted_standings, users, rosters, traded_picks, draft_year, pick_values, years=PICK_YEARS, rounds=PICK_ROUNDS):
+    """Build every team's draft picks for the next years x rounds, with trades applied and KTC values attached
+
+    Picks are laid out as flat arrays in (year, round, slot) order, so the row of any pick is plain arithmetic
+    and each traded pick is applied with dictionary lookups instead of a DataFrame search.
+    """
+    # Draft slots follow the reverse order of the standings
+    draft_order_team_names = [team[0] for team in sorted_standings[::-1]]
+    team_count = len(draft_order_team_names)
+
+    # Same names as the standings, which fall back to the display name when a user has no team name
+    team_name_by_user_id = {user["user_id"]: user_team_name(user) for user in users}
+    user_id_by_team_name = {team_name: user_id for user_id, team_name in team_name_by_user_id.items()}
+    user_id_by_roster_id = {roster["roster_id"]: roster["owner_id"] for roster in rosters}
+    slot_by_user_id = {user_id_by_team_name.get(team_name): slot for slot, team_name in enumerate(draft_order_team_names)}
+
+    draft_years = np.arange(draft_year, draft_year + years)
+    round_numbers = np.arange(1, rounds + 1)
+    slots = np.arange(team_count)
+
+    year_column = np.repeat(draft_years, rounds * team_count)
+    round_column = np.tile(np.repeat(round_numbers, team_count), years)
+    slot_column = np.tile(slots, years * rounds)
+
+    original_owner_ids = np.array([user_id_by_team_name.get(team_name) for team_name in draft_order_team_names], dtype=object)
+    owner_id = original_owner_ids[slot_column]
+    previous_owner_id = owner_id.copy()
+    is_traded = np.zeros(len(slot_column), dtype=bool)
+
+    # traded_picks holds the current owner of every pick that changed hands, keyed by season, round and original roster
+    for pick in traded_picks:
+        year_offset = int(pick.get("season", draft_year)) - draft_year
+        round_offset = pick["round"] - 1
+        slot = slot_by_user_id.get(user_id_by_roster_id.get(pick["roster_id"]))
+        if slot is None or not (0 <= year_offset < years) or not (0 <= round_offset < rounds):
+            continue
+        row = (year_offset * rounds + round_offset) * team_count + slot
+        owner_id[row] = user_id_by_roster_id.get(pick["owner_id"])
+        previous_owner_id[row] = user_id_by_roster_id.get(pick["previous_owner_id"])
+        is_traded[row] = owner_id[row] != original_owner_ids[slot]
+
+    pick_in_round = slot_column + 1
+    pick_position = np.where(pick_in_round <= team_count * 0.25, "Early", np.where(pick_in_round > team_count * 0.75, "Late", "Mid"))
+    ordinal_rounds = {round_num: f"{round_num}{get_ordinal_suffix(round_num)}" for round_num in round_numbers}
+
+    draft_order_df = pd.DataFrame({
+        "year": year_column,
+        "round": round_column,
+        "pick_in_round": pick_in_round,
+        "overall_pick": (round_column - 1) * team_count + pick_in_round,
+        "owner_team_name": [team_name_by_user_id.get(user_id) for user_id in owner_id],
+        "previous_owner_team_name": [team_name_by_user_id.get(user_id) if traded else None for user_id, traded in zip(previous_owner_id, is_traded)],
+        "owner_id": owner_id,
+        "previous_owner_id": previous_owner_id,
+        "original_owner_id": original_owner_ids[slot_column],
+        "is_traded": is_traded,
+        "pick_position": pick_position,
+    })
+    draft_order_df["KTC Pick Name"] = draft_order_df["year"].astype(str) + " " + draft_order_df["pick_position"] + " " + draft_order_df["round"].map(ordinal_rounds)
+    draft_order_df["KTC Value"] = draft_order_df["KTC Pick Name"].map(pick_values).fillna(0)
+    return draft_order_df
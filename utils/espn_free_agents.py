@@ -0,0 +1,98 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+FREE_AGENT_FETCH_WORKERS = 8
+
+def build_position_points_index(free_agents_week_df):
+    """Map each position to an ascending array of free agent projected points"""
+    return {
+        pos: np.sort(points.to_numpy(dtype=float))
+        for pos, points in free_agents_week_df.groupby("position", sort=False)["projected_points"]
+    }
+
+def count_better_options(points_index, position, projected_points):
+    """Count the free agents at a position projected for strictly more points, using a binary search"""
+    projected_points = np.asarray(projected_points, dtype=float)
+    sorted_points = points_index.get(position)
+    if sorted_points is None:
+        return np.zeros(projected_points.shape, dtype=int)
+    return len(sorted_points) - np.searchsorted(sorted_points, projected_points, side="right")
+
+def summarize_free_agent_positions(free_agents_week_df):
+    """Best free agent projection and player name per position, in one grouped pass"""
+    # free_agents_week_df is sorted by projected points descending, so the first row per position is the best
+    return free_agents_week_df.groupby("position", sort=False).agg(
+        max_proj_points=("projected_points", "max"),
+        max_player_name=("name", "first"),
+    )
+
+def build_improvement_table(roster_df, free_agents_week_df, points_index=None, position_summary=None):
+    """Potential improvement and number of better free agent options for every rostered player"""
+    if points_index is None:
+        points_index = build_position_points_index(free_agents_week_df)
+    if position_summary is None:
+        position_summary = summarize_free_agent_positions(free_agents_week_df)
+
+    improvement_df = roster_df[["name", "position", "projected_points"]].join(position_summary["max_proj_points"], on="position", how="inner")
+    improvement_df["improvement"] = improvement_df["max_proj_points"] - improvement_df["projected_points"]
+    improvement_df = improvement_df[improvement_df["improvement"] > 0].copy()
+
+    improvement_df["# Options"] = 0
+    for pos, group in improvement_df.groupby("position", sort=False):
+        improvement_df.loc[group.index, "# Options"] = count_better_options(points_index, pos, group["projected_points"])
+
+    return improvement_df.sort_values(by="improvement", ascending=False)
+
+@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour, called from worker threads so no spinner
+def get_weekly_free_agent_projections(_league, league_id, year, week, size=1000):
+    """Projected points of the league's free agent pool for a single week, one row per player"""
+    free_agents = _league.free_agents(size=size, week=week)
+    return pd.DataFrame({
+        "playerId": [player.playerId for player in free_agents],
+        "name": [player.name for player in free_agents],
+        "position": [player.position for player in free_agents],
+        "proTeam": [player.proTeam for player in free_agents],
+        "week": week,
+        "projected_points": [player.projected_points for player in free_agents],
+    })
+
+def get_remaining_weeks(league):
+    """Scoring periods from the current week through the end of the fantasy season"""
+    return list(range(league.current_week, league.finalScoringPeriod + 1))
+
+def build_projection_matrix(league, league_id, year, weeks, size=1000, max_workers=FREE_AGENT_FETCH_WORKERS):
+    """Fetch every week's free agent projections concurrently and assemble a players x weeks matrix
+
+    Returns (player_info_df, projection_matrix), both indexed by ESPN playerId. Players that are not
+    in the free agent pool for a given week (rostered or on bye) project 0 for that week.
+    """
+    # After the final scoring period there are no weeks left to project
+    if not weeks:
+        return pd.DataFrame(columns=["name", "position", "proTeam"]), pd.DataFrame(columns=weeks)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        weekly_frames = list(executor.map(
+            lambda week: get_weekly_free_agent_projections(league, league_id, year, week, size),
+            weeks
+        ))
+
+    weekly_df = pd.concat(weekly_frames, ignore_index=True)
+    if weekly_df.empty:
+        return pd.DataFrame(columns=["name", "position", "proTeam"]), pd.DataFrame(columns=weeks)
+
+    player_info_df = weekly_df.drop_duplicates(subset="playerId", keep="last").set_index("playerId")[["name", "position", "proTeam"]]
+    projection_matrix = weekly_df.pivot_table(index="playerId", columns="week", values="projected_points", aggfunc="first", fill_value=0.0)
+    projection_matrix = projection_matrix.reindex(index=player_info_df.index, columns=weeks, fill_value=0.0)
+    return player_info_df, projection_matrix
+
+def rank_free_agents_by_window(player_info_df, projection_matrix, window_weeks=3):
+    """Rank free agents by rest-of-season points and by points over the next window_weeks weeks"""
+    values = projection_matrix.to_numpy(dtype=float)
+    rankings_df = player_info_df.copy()
+    rankings_df["ROS Points"] = values.sum(axis=1)
+    rankings_df[f"Next {window_weeks} Weeks"] = values[:, :window_weeks].sum(axis=1)
+    rankings_df["ROS Rank"] = rankings_df["ROS Points"].rank(ascending=False, method="min")
+    rankings_df[f"Next {window_weeks} Rank"] = rankings_df[f"Next {window_weeks} Weeks"].rank(ascending=False, method="min")
+    return rankings_df.sort_values(by="ROS Points", ascending=False)
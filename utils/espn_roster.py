@@ -0,0 +1,79 @@
+import streamlit as st
+import pandas as pd
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+
+ROSTER_COLUMNS = ["name", "projected_points", "position", "posRank", "proTeam", "injuryStatus"]
+
+ROSTER_PROJECTION_FETCH_WORKERS = 8
+
+@st.cache_data(ttl=24 * 3600)  # Cache for 24 hours, the pro schedule is the same for every league
+def get_pro_schedule(_league, year, week):
+    return _league._get_pro_schedule(week)
+
+def fetch_team_lineup(league, team_id, week, pro_schedule=None):
+    """Fetch a single team's lineup for a scoring period, without downloading every box score in the league"""
+    params = {
+        "view": "mRoster",
+        "scoringPeriodId": week,
+        "forTeamId": team_id,
+    }
+    data = league.espn_request.league_get(params=params)
+
+    # forTeamId narrows the response to one team, but still check the id in case ESPN returns the whole league
+    team_data = next((team for team in data.get("teams", []) if team["id"] == team_id), None)
+    if team_data is None:
+        return []
+
+    if pro_schedule is None:
+        pro_schedule = league._get_pro_schedule(week)
+
+    from espn_api.football.box_player import BoxPlayer
+
+    entries = team_data.get("roster", {}).get("entries", [])
+    return [BoxPlayer(entry, pro_schedule, {}, week, league.year) for entry in entries]
+
+@st.cache_data(ttl=900)  # Cache for 15 minutes, lineups change during the week
+def get_team_lineup_df(_league, league_id, year, team_id, week):
+    """Weekly lineup of one team as a DataFrame, cached per league, team and week"""
+    pro_schedule = get_pro_schedule(_league, year, week)
+    lineup = fetch_team_lineup(_league, team_id, week, pro_schedule=pro_schedule)
+
+    roster_dict = {}
+    for player in lineup:
+        roster_dict[player.name] = player.__dict__
+    roster_df = pd.DataFrame.from_dict(roster_dict, orient="index")
+    if roster_df.empty:
+        return pd.DataFrame(columns=ROSTER_COLUMNS)
+    return roster_df[ROSTER_COLUMNS]
+
+@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour, called from worker threads so no spinner
+def get_league_week_projections(_league, league_id, year, week):
+    """Projected points of every rostered player in the league for a single week, from one mRoster request"""
+    data = _league.espn_request.league_get(params={"view": "mRoster", "scoringPeriodId": week})
+    pro_schedule = get_pro_schedule(_league, year, week)
+
+    from espn_api.football.box_player import BoxPlayer
+
+    rows = []
+    for team_data in data.get("teams", []):
+        for entry in team_data.get("roster", {}).get("entries", []):
+            player = BoxPlayer(entry, pro_schedule, {}, week, year)
+            # Missing projections stay NaN so the caller can tell them apart from a projected 0
+            rows.append({"team_id": team_data["id"], "playerId": player.playerId, "week": week, "projected_points": player.stats.get(week, {}).get("projected_points", np.nan)})
+    return pd.DataFrame(rows, columns=["team_id", "playerId", "week", "projected_points"])
+
+def build_roster_projection_matrix(league, league_id, year, weeks, max_workers=ROSTER_PROJECTION_FETCH_WORKERS):
+    """Fetch every week's rostered player projections concurrently as a playerId x weeks matrix, NaN where ESPN has none"""
+    if not weeks:
+        return pd.DataFrame(columns=weeks, dtype=float)
+
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        weekly_frames = list(executor.map(
+            lambda week: get_league_week_projections(league, league_id, year, week),
+            weeks
+        ))
+
+    weekly_df = pd.concat(weekly_frames, ignore_index=True)
+    projection_matrix = weekly_df.pivot_table(index="playerId", columns="week", values="projected_points", aggfunc="first")
+    return projection_matrix.reindex(columns=weeks).astype(float)
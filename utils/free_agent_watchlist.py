@@ -0,0 +1,132 @@
+import os
+import json
+import datetime
+import pandas as pd
+
+from utils.nfl_teams import build_dst_index, resolve_team
+
+# Each league/year/week gets a JSON-lines file: the first line is the full free agent snapshot,
+# every following line only holds the delta (added, dropped, projection changes) from one poll.
+WATCHLIST_DIR = os.path.join("cache", "watchlist")
+
+# Projection moves smaller than this are noise and are not stored as changes
+MIN_PROJECTION_CHANGE = 0.1
+
+def watchlist_path(league_id, year, week):
+    return os.path.join(WATCHLIST_DIR, f"{league_id}_{year}_week{week}.jsonl")
+
+def snapshot_free_agents(free_agents):
+    """Key the free agent pool by ESPN playerId, keeping only the fields that are diffed"""
+    return {
+        str(player.playerId): {
+            "name": player.name,
+            "position": player.position,
+            "proTeam": player.proTeam,
+            "projected_points": round(float(player.projected_points), 2),
+        }
+        for player in free_agents
+    }
+
+def diff_free_agent_pools(previous, current, min_projection_change=MIN_PROJECTION_CHANGE):
+    """Keyed diff between two free agent snapshots"""
+    added = {player_id: current[player_id] for player_id in current.keys() - previous.keys()}
+    dropped = {player_id: previous[player_id] for player_id in previous.keys() - current.keys()}
+    changed = {}
+    for player_id in current.keys() & previous.keys():
+        old_points = previous[player_id]["projected_points"]
+        new_points = current[player_id]["projected_points"]
+        if abs(new_points - old_points) >= min_projection_change:
+            changed[player_id] = {"previous_projected_points": old_points, "projected_points": new_points}
+    return {"added": added, "dropped": dropped, "changed": changed}
+
+def is_empty_diff(diff):
+    return not (diff["added"] or diff["dropped"] or diff["changed"])
+
+def apply_free_agent_diff(state, diff):
+    """Apply a stored delta to a reconstructed snapshot, in place"""
+    for player_id in diff["dropped"]:
+        state.pop(player_id, None)
+    state.update(diff["added"])
+    for player_id, change in diff["changed"].items():
+        if player_id in state:
+            state[player_id]["projected_points"] = change["projected_points"]
+    return state
+
+def load_watchlist(path):
+    """Replay a watchlist file, returning (current_state, list of delta records)"""
+    if not os.path.exists(path):
+        return None, []
+    state = None
+    deltas = []
+    with open(path) as watchlist_file:
+        for line in watchlist_file:
+            record = json.loads(line)
+            if record["type"] == "snapshot":
+                state = record["players"]
+            else:
+                apply_free_agent_diff(state, record["diff"])
+                deltas.append(record)
+    return state, deltas
+
+def poll_watchlist(league_id, year, week, free_agents):
+    """Diff the current free agent pool against the last stored state and append the delta
+
+    The first poll for a league/week stores the full snapshot and returns an empty diff.
+    """
+    path = watchlist_path(league_id, year, week)
+    previous, _ = load_watchlist(path)
+    current = snapshot_free_agents(free_agents)
+    timestamp = datetime.datetime.now(datetime.timezone.utc).isoformat()
+
+    os.makedirs(WATCHLIST_DIR, exist_ok=True)
+    if previous is None:
+        with open(path, "w") as watchlist_file:
+            watchlist_file.write(json.dumps({"type": "snapshot", "timestamp": timestamp, "players": current}) + "\n")
+        return diff_free_agent_pools(current, current)
+
+    diff = diff_free_agent_pools(previous, current)
+    if not is_empty_diff(diff):
+        with open(path, "a") as watchlist_file:
+            watchlist_file.write(json.dumps({"type": "delta", "timestamp": timestamp, "diff": diff}) + "\n")
+    return diff
+
+def lookup_vorp(names, combined_data):
+    """Season VORP for ESPN player names, resolving "Eagles D/ST" style names through the team index"""
+    vorp_by_player = dict(zip(combined_data["Player"], combined_data["VORP"]))
+    dst_index = build_dst_index(combined_data)
+    vorp = []
+    for name in names:
+        if name in vorp_by_player:
+            vorp.append(vorp_by_player[name])
+        elif name.endswith(" D/ST"):
+            vorp.append(vorp_by_player.get(dst_index.get(resolve_team(name))))
+        else:
+            vorp.append(None)
+    return pd.Series(vorp, index=names.index if isinstance(names, pd.Series) else None, dtype=float)
+
+def diff_to_dataframe(diff, timestamp=None):
+    """Flatten a diff into one row per changed player"""
+    rows = []
+    for change_type in ["added", "dropped"]:
+        for player_id, player in diff[change_type].items():
+            rows.append({"change": change_type, "playerId": player_id, **player})
+    for player_id, change in diff["changed"].items():
+        rows.append({"change": "projection", "playerId": player_id, **change})
+    diff_df = pd.DataFrame(rows, columns=["change", "playerId", "name", "position", "proTeam", "projected_points", "previous_projected_points"])
+    if timestamp is not None:
+        diff_df["timestamp"] = timestamp
+    return diff_df
+
+def watchlist_history_dataframe(league_id, year, week, combined_data):
+    """All stored deltas for a league/week as one frame, newest first"""
+    state, deltas = load_watchlist(watchlist_path(league_id, year, week))
+    if state is None or not deltas:
+        return pd.DataFrame(columns=["change", "playerId", "name", "position", "proTeam", "projected_points", "previous_projected_points", "timestamp", "VORP"])
+
+    history_df = pd.concat([diff_to_dataframe(record["diff"], record["timestamp"]) for record in deltas], ignore_index=True)
+
+    # Projection changes only carry numbers, so fill names from the reconstructed state
+    names = {player_id: player["name"] for player_id, player in state.items()}
+    history_df["name"] = history_df["name"].fillna(history_df["playerId"].map(names))
+    history_df["VORP"] = lookup_vorp(history_df["name"].fillna(""), combined_data)
+    return history_df.sort_values(by="timestamp", ascending=False)
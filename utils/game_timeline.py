@@ -0,0 +1,130 @@
+import re
+import pandas as pd
+
+from utils.nfl_teams import canonical_team_abbreviation
+
+# "SF @ ATL" / "SF at ATL" list the away team first, "ATL VS SF" lists the home team first
+SHORT_NAME_PATTERN = re.compile(r"^\s*(?P<first>\S+)\s+(?P<separator>@|at|At|AT|vs|VS|Vs)\s+(?P<second>\S+)\s*$")
+HOME_FIRST_SEPARATORS = {"vs", "VS", "Vs"}
+
+GAME_STATUS_MAP = {
+    "pre": "Scheduled",
+    "in": "In Progress",
+    "post": "Final",
+}
+
+def parse_short_name(short_name):
+    """Parse an ESPN game short name into (away_team, home_team), or None if it cannot be parsed"""
+    match = SHORT_NAME_PATTERN.match(short_name)
+    if match is None:
+        return None
+    if match.group("separator") in HOME_FIRST_SEPARATORS:
+        return match.group("second"), match.group("first")
+    return match.group("first"), match.group("second")
+
+def build_week_games(schedule_data, timezone):
+    """Normalize one ESPN schedule week into a frame with one row per game
+
+    Returns (games_df, unparsed_short_names).
+    """
+    rows = []
+    unparsed_short_names = []
+    for date_string, day in schedule_data.items():
+        for game in day["games"]:
+            teams = parse_short_name(game["shortName"])
+            if teams is None:
+                unparsed_short_names.append(game["shortName"])
+                continue
+            away_team, home_team = teams
+            state = game["status"]["type"]["state"]
+            rows.append({
+                "date_string": date_string,
+                "game": f"{away_team} at {home_team}",
+                "away_team": away_team,
+                "home_team": home_team,
+                "status": GAME_STATUS_MAP.get(state, state.capitalize()),
+                "start_time": game["date"],
+            })
+
+    games_df = pd.DataFrame(rows, columns=["date_string", "game", "away_team", "home_team", "status", "start_time"])
+    games_df["game_time"] = pd.to_datetime(games_df["start_time"], utc=True).dt.tz_convert(timezone)
+    games_df = games_df.drop(columns="start_time")
+    return games_df, unparsed_short_names
+
+def build_team_game_index(games_df):
+    """Long frame with one row per (team, game), keyed by canonical team abbreviation"""
+    team_games_df = pd.concat([
+        games_df.assign(team_key=games_df["away_team"]),
+        games_df.assign(team_key=games_df["home_team"]),
+    ], ignore_index=True)
+    team_games_df["team_key"] = team_games_df["team_key"].map(canonical_team_abbreviation)
+    return team_games_df
+
+def players_in_games(roster, team_games_df):
+    """Match every rostered player to their team's game this week with one join"""
+    roster = roster.assign(team_key=roster["team"].astype(object).map(canonical_team_abbreviation))
+    timeline_df = roster.merge(team_games_df, on="team_key", how="inner")
+    timeline_df["player_full_name"] = timeline_df["search_first_name"].astype(str) + " " + timeline_df["search_last_name"].astype(str)
+    return timeline_df.drop(columns="team_key")
+
+def build_game_summary(timeline_df, team_color_map):
+    """One row per game with player counts, KTC totals, hover text and bar geometry, in one grouped pass"""
+    # Grouped by kickoff as well, so a matchup that repeats within a range of weeks stays two games
+    game_df = timeline_df.groupby(["game", "game_time"], sort=False).agg(
+        num_players=("player_full_name", "size"),
+        total_ktc_value=("KTC Value", "sum"),
+        players=("player_full_name", "<br>".join),
+        home_team=("home_team", "first"),
+        away_team=("away_team", "first"),
+        status=("status", "first"),
+    ).reset_index()
+    game_df["date"] = game_df["game_time"].dt.date
+    game_df["time_of_day"] = game_df["game_time"].dt.time
+    game_df = game_df.sort_values(by=["game_time", "num_players"], ascending=[True, False]).reset_index(drop=True)
+
+    # Bar widths for each datetime are based on the number of games at that datetime
+    game_df["num_games_at_time"] = game_df.groupby("game_time")["game"].transform("size")
+    game_df["bar_width"] = 1.0 / game_df["num_games_at_time"]
+    game_df["game_index"] = game_df.groupby("game_time").cumcount()
+
+    # Bars are centered on the x-axis value, so offset them based on their index and the number of games at that time
+    game_df["bar_offset"] = -game_df["bar_width"] / 2 + (game_df["game_index"] - (game_df["num_games_at_time"] - 1) / 2) * game_df["bar_width"]
+
+    game_df["game_time_str"] = game_df["game_time"].dt.strftime("%a %m/%d %I:%M %p")
+    game_df["color"] = game_df["home_team"].map(canonical_team_abbreviation).map(team_color_map)
+    game_df["hover_text"] = "<b>" + game_df["game"] + "</b><br>Number of Players: " + game_df["num_players"].astype(str) + "<br><br><b>Players:</b><br>" + game_df["players"]
+    return game_df
+
+def build_games_figure(game_df):
+    """Grouped bar chart of players per game, built as a single trace from the summary columns"""
+    from plotly import graph_objects as go
+
+    fig = go.Figure(go.Bar(
+        x=game_df["game_time_str"],
+        y=game_df["num_players"],
+        width=game_df["bar_width"] * 0.8,  # Scale down to 80% to give some space between bars
+        offset=game_df["bar_offset"],
+        marker_color=game_df["color"].fillna("#888888"),
+        text=game_df["game"],
+        textposition="outside",
+        hovertext=game_df["hover_text"],
+        hovertemplate="%{hovertext}<extra></extra>",
+    ))
+
+    # Set the height of the figure based on the maximum number of players in any game
+    max_players = game_df["num_players"].max()
+    fig.update_layout(
+        title="Number of Players in Each Game",
+        xaxis_title="Game Time",
+        yaxis_title="Number of Players",
+        barmode="group",
+        height=400 + max_players * 20,
+    )
+    return fig
+
+def build_impactful_games(game_df):
+    """Rank the week's games by the KTC value and number of the team's players in them"""
+    impactful_game_df = game_df[["game", "date", "time_of_day", "status", "num_players", "total_ktc_value", "home_team", "away_team", "game_time", "game_time_str"]].copy()
+    impactful_game_df["impact_score"] = impactful_game_df["total_ktc_value"] * 0.7 + impactful_game_df["num_players"] * 0.3  # Weighted score
+    impactful_game_df = impactful_game_df.sort_values(by=["impact_score", "num_players"], ascending=[False, False])
+    return impactful_game_df.reset_index(drop=True)
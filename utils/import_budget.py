@@ -0,0 +1,76 @@
+import ast
+import sys
+import subprocess
+
+# Import-time budget per page. Each page's top-level imports are timed in a fresh interpreter. main.py
+# is timed after Streamlit and pandas (the server always has Streamlit loaded, and every page needs
+# pandas, whose ~0.4s would drown out everything else), and every other page after main.py's
+# imports, since main.py runs before each page. The number is what a cold start or the first switch to
+# the page adds. Heavy libraries should be imported inside the functions that use them.
+
+MAIN_PAGE = "main.py"
+
+# Seconds, with headroom over the measured cost, so only a new heavy import trips the check
+PAGE_IMPORT_BUDGETS = {
+    "main.py": 0.15,
+    "pages/espn/free_agents_espn.py": 0.05,
+    "pages/espn/data_overview.py": 0.05,
+    "pages/espn/live_draft.py": 0.05,
+    "pages/espn/lineup_planner.py": 0.05,
+    "pages/sleeper/sleeper_integration.py": 0.05,
+    "pages/sleeper/league_batch.py": 0.05,
+}
+
+IMPORT_TIMING_REPEATS = 3
+
+# Heavy libraries only the functions that use them may import, never a page's top level. Streamlit
+# itself loads plotly.graph_objects, so of plotly only plotly.express is deferred.
+LAZY_MODULES = ["plotly.express", "espn_api", "sleeper_wrapper", "bs4"]
+
+TIMING_SCRIPT = """
+import time
+import streamlit
+import pandas
+exec(compile({preload_source!r}, "preload", "exec"))
+start = time.perf_counter()
+exec(compile({source!r}, {page_path!r}, "exec"))
+print(time.perf_counter() - start)
+"""
+
+LOADED_MODULES_SCRIPT = """
+import sys
+import streamlit
+import pandas
+preloaded = set(sys.modules)
+exec(compile({source!r}, "pages", "exec"))
+print(" ".join(name for name in {lazy_modules!r} if name in sys.modules and name not in preloaded))
+"""
+
+def page_import_source(page_path):
+    """The page's top-level import statements, without running the rest of the page"""
+    with open(page_path) as page_file:
+        tree = ast.parse(page_file.read(), filename=page_path)
+    imports = [node for node in tree.body if isinstance(node, (ast.Import, ast.ImportFrom))]
+    return "\n".join(ast.unparse(node) for node in imports)
+
+def measure_page_import_seconds(page_path, repeats=IMPORT_TIMING_REPEATS):
+    """Fastest of several cold imports of the page's modules, in seconds"""
+    preload_source = "" if page_path == MAIN_PAGE else page_import_source(MAIN_PAGE)
+    script = TIMING_SCRIPT.format(preload_source=preload_source, source=page_import_source(page_path), page_path=page_path)
+    timings = []
+    for _ in range(repeats):
+        result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+        timings.append(float(result.stdout.strip().splitlines()[-1]))
+    return min(timings)
+
+def check_import_budgets(budgets=PAGE_IMPORT_BUDGETS, repeats=IMPORT_TIMING_REPEATS):
+    """(page, seconds, budget) for every page, and whether all of them are within budget"""
+    results = [(page_path, measure_page_import_seconds(page_path, repeats), budget) for page_path, budget in budgets.items()]
+    return results, all(seconds <= budget for _, seconds, budget in results)
+
+def eagerly_imported_modules(page_paths=tuple(PAGE_IMPORT_BUDGETS), lazy_modules=LAZY_MODULES):
+    """The lazy modules that importing every page's modules pulls in beyond Streamlit and pandas, which should be none"""
+    source = "\n".join(page_import_source(page_path) for page_path in page_paths)
+    script = LOADED_MODULES_SCRIPT.format(source=source, lazy_modules=list(lazy_modules))
+    result = subprocess.run([sys.executable, "-c", script], capture_output=True, text=True, check=True)
+    return result.stdout.split()
@@ -0,0 +1,90 @@
+import re
+import pandas as pd
+
+from utils.nfl_teams import canonical_team_abbreviation
+
+# Name suffixes KTC keeps ("Brian Thomas Jr.") but Sleeper's search names drop
+NAME_SUFFIXES = {"jr", "sr", "ii", "iii", "iv", "v"}
+
+KTC_KEY_COLUMNS = ["first_key", "last_key", "team_key"]
+
+def normalize_name_part(text):
+    """Lowercase and strip everything but letters and digits, matching Sleeper's search_*_name fields"""
+    if text is None or pd.isna(text):
+        return ""
+    return re.sub(r"[^a-z0-9]", "", str(text).lower())
+
+def split_ktc_name(name):
+    """Split a KTC display name into normalized (first, last) keys"""
+    tokens = str(name).split()
+    while len(tokens) > 2 and normalize_name_part(tokens[-1]) in NAME_SUFFIXES:
+        tokens = tokens[:-1]
+    if not tokens:
+        return "", ""
+    return normalize_name_part(tokens[0]), normalize_name_part("".join(tokens[1:]))
+
+def build_ktc_index(keeptradecut_df, value_column="SFValue"):
+    """Build the KTC player lookup table once per scrape
+
+    Returns a DataFrame with normalized first/last/team keys and a "KTC Value" column, one row per key.
+    Draft picks are left out, they are valued by name in the pick ledger.
+    """
+    # Player Names are in the first column of keeptradecut_df
+    ktc_name_column = keeptradecut_df.columns[0]
+    players_df = keeptradecut_df[keeptradecut_df["Position"] != "PI"]
+
+    name_keys = [split_ktc_name(name) for name in players_df[ktc_name_column]]
+    ktc_index = pd.DataFrame({
+        "first_key": [first for first, _ in name_keys],
+        "last_key": [last for _, last in name_keys],
+        "team_key": [canonical_team_abbreviation(team) for team in players_df["Team"]],
+        "KTC Value": players_df[value_column].to_numpy(),
+    })
+
+    # KTC is sorted by value, so the first row per key is the one the old row-by-row search returned
+    return ktc_index.drop_duplicates(subset=KTC_KEY_COLUMNS, keep="first").reset_index(drop=True)
+
+def sleeper_player_keys(player_df):
+    """Normalized first/last/team keys for a frame of Sleeper players"""
+    return pd.DataFrame({
+        "first_key": player_df["search_first_name"].map(normalize_name_part),
+        "last_key": player_df["search_last_name"].map(normalize_name_part),
+        "team_key": player_df["team"].astype(object).map(canonical_team_abbreviation),
+    }, index=player_df.index)
+
+def value_players(player_df, ktc_index):
+    """KTC value for every row of a Sleeper player frame with one join, aligned to player_df's index
+
+    Players are matched on first name, last name and team. Players whose team does not match KTC
+    (stale team after a trade, or no team) fall back to a name-only match when that name is unique in KTC.
+    """
+    keys_df = sleeper_player_keys(player_df)
+
+    values = keys_df.merge(ktc_index, on=KTC_KEY_COLUMNS, how="left")["KTC Value"].to_numpy()
+
+    unique_names = ktc_index.drop_duplicates(subset=["first_key", "last_key"], keep=False)[["first_key", "last_key", "KTC Value"]]
+    name_values = keys_df.merge(unique_names, on=["first_key", "last_key"], how="left")["KTC Value"].to_numpy()
+
+    return pd.Series(values, index=player_df.index, dtype=float).fillna(pd.Series(name_values, index=player_df.index, dtype=float))
+
+def value_undrafted_players(players_df, drafted_player_ids, ktc_index, columns, keys_df=None):
+    """Value every KTC-ranked player that is not on a roster
+
+    The pool is restricted to players whose name appears in KTC before anything else is built,
+    so only a few hundred of Sleeper's ~10k players are joined and copied.
+    """
+    # Keys built from another copy of the store would not line up row for row, so rebuild them
+    if keys_df is None or not keys_df.index.equals(players_df.index):
+        keys_df = sleeper_player_keys(players_df)
+
+    ranked_names = pd.MultiIndex.from_frame(ktc_index[["first_key", "last_key"]])
+    is_ranked = pd.MultiIndex.from_frame(keys_df[["first_key", "last_key"]]).isin(ranked_names)
+    is_undrafted = ~players_df.index.isin(list(drafted_player_ids))
+
+    undrafted_player_df = players_df[is_ranked & is_undrafted].reset_index()[columns]
+
+    # Drop rows with missing first or last name, no team, or no depth chart spot
+    undrafted_player_df = undrafted_player_df.dropna(subset=["search_first_name", "search_last_name", "team", "depth_chart_order"])
+
+    undrafted_player_df["KTC Value"] = value_players(undrafted_player_df, ktc_index).fillna(0)
+    return undrafted_player_df.sort_values(by="KTC Value", ascending=False)
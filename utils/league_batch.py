@@ -0,0 +1,193 @@
+import sys
+import argparse
+import datetime
+import pytz
+import requests
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.ktc_index import value_players
+from utils.draft_pick_ledger import build_pick_ledger
+from utils.nfl_teams import canonical_team_abbreviation
+from utils.sleeper_loaders import get_league, get_league_users, get_league_rosters, get_league_traded_picks, get_nfl_state, get_standings, user_team_name
+from utils.roster_value_history import record_batch_snapshot
+from utils.sleeper_shared_data import get_all_players, get_ktc_index, get_ktc_pick_values, get_season_team_games
+
+# Values many Sleeper leagues in one run. Everything that does not depend on the league (KTC values,
+# the players database, the season schedule) is loaded once and shared by every league's worker.
+
+ROSTER_COLUMNS = ["player_id", "search_first_name", "search_last_name", "fantasy_positions", "team", "number", "age", "years_exp", "depth_chart_order"]
+
+LEAGUE_WORKERS = 4
+BATCH_TIMEZONE = "US/Eastern"
+
+def sorted_league_standings(rosters, users):
+    """League standings as (team_name, wins, losses, points_for) tuples, best team first"""
+    standings = get_standings(rosters, users)
+
+    for i in range(len(standings)):
+        standings[i] = list(standings[i])
+        standings[i][3] = float(standings[i][3])  # Points For
+        standings[i] = tuple(standings[i])
+
+    # standings: List of tuples (team_name, wins, losses, points_for, ...)
+    return sorted(
+        standings,
+        key=lambda x: (x[1], x[3]),  # x[1]=wins, x[3]=points_for
+        reverse=True
+    )
+
+def get_draft_year(now):
+    """The next rookie draft is this year until April, next year after"""
+    if now.month < 4:
+        return now.year
+    return now.year + 1
+
+def value_league_rosters(roster_state, players_df, ktc_index):
+    """Value every rostered player in a league with one KTC join
+
+    roster_state is a tuple of (owner_id, player_ids) pairs.
+    """
+    owner_ids = [owner_id for owner_id, player_ids in roster_state for _ in player_ids]
+    player_ids = [player_id for _, player_ids in roster_state for player_id in player_ids]
+
+    owners_df = pd.DataFrame({"owner_id": owner_ids}, index=pd.Index(player_ids, name="player_id"))
+    # The team column is widened so it can be filled later
+    league_roster_df = owners_df.join(players_df, how="inner").reset_index().astype({"team": object})
+    league_roster_df = league_roster_df[["owner_id"] + ROSTER_COLUMNS]
+
+    league_roster_df["KTC Value"] = value_players(league_roster_df, ktc_index).fillna(0)
+    return league_roster_df.sort_values(by="KTC Value", ascending=False)
+
+def load_shared_data(current_year, timezone=BATCH_TIMEZONE):
+    """Load the league-independent data once, concurrently: players, KTC values and the season schedule"""
+    def load_ktc():
+        # The index and the pick values come from the same scrape, so they are built one after the other
+        return get_ktc_index(), get_ktc_pick_values()
+
+    with ThreadPoolExecutor(max_workers=3) as executor:
+        players_future = executor.submit(get_all_players)
+        ktc_future = executor.submit(load_ktc)
+        schedule_future = executor.submit(get_season_team_games, current_year, timezone)
+
+        ktc_index, pick_values = ktc_future.result()
+        team_game_table, _ = schedule_future.result()
+        return {
+            "players": players_future.result(),
+            "ktc_index": ktc_index,
+            "pick_values": pick_values,
+            "team_game_table": team_game_table,
+        }
+
+def teams_playing_in_week(team_game_table, week):
+    """Canonical abbreviations of every team with a game in the given week"""
+    if week is None or week not in team_game_table.index.get_level_values("week"):
+        return set()
+    return set(team_game_table.loc[week].index)
+
+def evaluate_league(league_id, shared, draft_year, week=None):
+    """One row per team in the league with its record and KTC roster and pick values"""
+    league = get_league(league_id)
+    users = get_league_users(league_id)
+    rosters = get_league_rosters(league_id)
+    traded_picks = get_league_traded_picks(league_id)
+
+    sorted_standings = sorted_league_standings(rosters, users)
+    draft_order_df = build_pick_ledger(sorted_standings, users, rosters, traded_picks, draft_year, shared["pick_values"])
+    picks_value_by_owner = draft_order_df.groupby("owner_id")["KTC Value"].sum()
+    picks_count_by_owner = draft_order_df.groupby("owner_id").size()
+
+    roster_state = tuple((roster["owner_id"], tuple(roster["players"] or [])) for roster in rosters)
+    league_roster_df = value_league_rosters(roster_state, shared["players"], shared["ktc_index"])
+    teams_this_week = teams_playing_in_week(shared["team_game_table"], week)
+    league_roster_df["has_game"] = league_roster_df["team"].map(canonical_team_abbreviation).isin(teams_this_week)
+    roster_summary = league_roster_df.groupby("owner_id").agg(
+        player_ktc_value=("KTC Value", "sum"),
+        num_players=("player_id", "size"),
+        players_with_games=("has_game", "sum"),
+    )
+
+    record_by_owner = {roster["owner_id"]: roster["settings"] for roster in rosters}
+    rows = []
+    for user in users:
+        user_id = user["user_id"]
+        settings = record_by_owner.get(user_id, {})
+        player_ktc_value = roster_summary["player_ktc_value"].get(user_id, 0)
+        picks_ktc_value = picks_value_by_owner.get(user_id, 0)
+        rows.append({
+            "League ID": league_id,
+            "League Name": league.get("name") or league_id,
+            "Owner ID": user_id,
+            "User": user["display_name"],
+            "Team Name": user_team_name(user),
+            "Wins": settings.get("wins", 0),
+            "Losses": settings.get("losses", 0),
+            "Points For": settings.get("fpts", 0),
+            "Player KTC Value": player_ktc_value,
+            "Draft Picks KTC Value": picks_ktc_value,
+            "Total KTC Value": player_ktc_value + picks_ktc_value,
+            "Number of Players": int(roster_summary["num_players"].get(user_id, 0)),
+            "Number of Draft Picks": int(picks_count_by_owner.get(user_id, 0)),
+            "Players With Games This Week": int(roster_summary["players_with_games"].get(user_id, 0)),
+        })
+
+    league_df = pd.DataFrame(rows)
+    league_df["League KTC Rank"] = league_df["Total KTC Value"].rank(ascending=False, method="min").astype(int)
+    league_df["Share of League KTC Value"] = league_df["Total KTC Value"] / league_df["Total KTC Value"].sum()
+    return league_df.sort_values(by="League KTC Rank")
+
+def evaluate_leagues(league_ids, shared, draft_year, week=None, max_workers=LEAGUE_WORKERS):
+    """Evaluate every league on a worker pool and consolidate the results into one table
+
+    Returns (comparison_df, errors), where errors maps each league that failed to load to its error message.
+    """
+    frames = []
+    errors = {}
+    with ThreadPoolExecutor(max_workers=max_workers) as executor:
+        futures = {league_id: executor.submit(evaluate_league, league_id, shared, draft_year, week) for league_id in league_ids}
+        for league_id, future in futures.items():
+            try:
+                frames.append(future.result())
+            except (requests.RequestException, KeyError, TypeError, ValueError) as e:
+                errors[league_id] = str(e)
+
+    if not frames:
+        return pd.DataFrame(), errors
+    return pd.concat(frames, ignore_index=True), errors
+
+def run_batch(league_ids, max_workers=LEAGUE_WORKERS, timezone=BATCH_TIMEZONE):
+    """Load the shared data and evaluate every league, for the current season and NFL week"""
+    now = datetime.datetime.now(pytz.timezone(timezone))
+    nfl_state = get_nfl_state()
+    week = nfl_state.get("week") if nfl_state else None
+    shared = load_shared_data(now.year, timezone)
+    return evaluate_leagues(league_ids, shared, get_draft_year(now), week, max_workers=max_workers)
+
+def snapshot_batch(comparison_df, timezone=BATCH_TIMEZONE):
+    """Record today's values for every league in the batch into the roster value history"""
+    snapshot_date = datetime.datetime.now(pytz.timezone(timezone)).date()
+    return record_batch_snapshot(comparison_df, snapshot_date)
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Compare KTC roster values across many Sleeper leagues")
+    parser.add_argument("league_ids", nargs="+", help="Sleeper league IDs")
+    parser.add_argument("--output", help="Write the comparison table to this CSV file instead of printing it")
+    parser.add_argument("--snapshot", action="store_true", help="Also record today's team values in the roster value history")
+    parser.add_argument("--workers", type=int, default=LEAGUE_WORKERS, help="Number of leagues evaluated at once")
+    args = parser.parse_args(argv)
+
+    comparison_df, errors = run_batch(args.league_ids, max_workers=args.workers)
+    for league_id, error in errors.items():
+        print(f"Could not evaluate league {league_id}: {error}", file=sys.stderr)
+
+    if args.snapshot and not comparison_df.empty:
+        print(f"Recorded {snapshot_batch(comparison_df)} changed team values", file=sys.stderr)
+
+    if args.output:
+        comparison_df.to_csv(args.output, index=False)
+    else:
+        print(comparison_df.to_string(index=False))
+    return 1 if errors else 0
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,200 @@
+import numpy as np
+import pandas as pd
+
+from utils.nfl_teams import canonical_team_abbreviation
+
+# Best starting lineup for every remaining week, for every team in a league at once.
+# Projections are a teams x players x weeks array (padded with -inf). Within a position the best
+# players always start first, so a lineup is decided by how many players of each position start.
+# Every count vector the league's slots can hold is enumerated once, and each team-week takes the
+# count vector with the highest sum of its per-position top-k points. This is an exact solution of
+# the slot assignment for any mix of flex slots, overlapping ones like RB/WR with WR/TE included,
+# and it is evaluated for all teams and weeks with array operations.
+
+# Positions each lineup slot accepts, using espn_api's slot names
+SLOT_ELIGIBILITY = {
+    "QB": ["QB"],
+    "RB": ["RB"],
+    "WR": ["WR"],
+    "TE": ["TE"],
+    "K": ["K"],
+    "D/ST": ["D/ST"],
+    "RB/WR": ["RB", "WR"],
+    "WR/TE": ["WR", "TE"],
+    "RB/WR/TE": ["RB", "WR", "TE"],
+    "OP": ["QB", "RB", "WR", "TE"],
+}
+
+LINEUP_POSITIONS = ["QB", "RB", "WR", "TE", "K", "D/ST"]
+
+DEFAULT_LINEUP_SLOTS = {"QB": 1, "RB": 2, "WR": 2, "TE": 1, "RB/WR/TE": 1, "D/ST": 1, "K": 1}
+
+# A week is flagged when byes cost a team at least this fraction of its full-strength lineup
+BYE_CRUNCH_THRESHOLD = 0.15
+
+def starting_slots(position_slot_counts=None):
+    """Starting slots in display order (dedicated slots before flex), ignoring bench, IR and unsupported slots"""
+    slot_counts = position_slot_counts or DEFAULT_LINEUP_SLOTS
+    slots = [(slot, count) for slot, count in slot_counts.items() if slot in SLOT_ELIGIBILITY and count > 0]
+    return sorted(slots, key=lambda item: len(SLOT_ELIGIBILITY[item[0]]))
+
+def load_bye_weeks(adp_df):
+    """Map canonical team abbreviation -> bye week from the FantasyPros ADP export"""
+    byes_df = adp_df[["Team", "Bye"]].dropna().drop_duplicates(subset="Team")
+    bye_weeks = pd.to_numeric(byes_df["Bye"], errors="coerce")
+    return {
+        canonical_team_abbreviation(team): int(bye)
+        for team, bye in zip(byes_df["Team"], bye_weeks)
+        if not pd.isna(bye)
+    }
+
+def build_projection_arrays(players_df, projection_matrix, weeks, bye_weeks):
+    """Lay a league's rostered players out as teams x players x weeks arrays
+
+    players_df has one row per rostered player with team_id, name, position, proTeam and weekly_points
+    (the season average). projection_matrix holds each player's projection per week, players x weeks and
+    aligned with players_df's rows; weeks without a projection (NaN) fall back to the season average.
+    Returns (team_ids, names, positions, healthy_points, points), where points has each player's bye week
+    zeroed and healthy_points uses the season average on the bye week instead. Padding rows are -inf so
+    they are never picked.
+    """
+    weeks = np.asarray(weeks)
+    team_ids = list(dict.fromkeys(players_df["team_id"]))
+    team_rows = {team_id: np.flatnonzero(players_df["team_id"].to_numpy() == team_id) for team_id in team_ids}
+    max_players = max((len(rows) for rows in team_rows.values()), default=0)
+
+    average_points = players_df["weekly_points"].to_numpy(dtype=float)
+    weekly_points = np.asarray(projection_matrix, dtype=float).reshape(len(players_df), len(weeks))
+    weekly_points = np.where(np.isnan(weekly_points), average_points[:, None], weekly_points)
+
+    player_byes = players_df["proTeam"].map(canonical_team_abbreviation).map(bye_weeks).fillna(0).astype(int).to_numpy()
+    on_bye = player_byes[:, None] == weeks[None, :]
+    player_points = np.where(on_bye, 0.0, weekly_points)
+    player_healthy_points = np.where(on_bye, average_points[:, None], weekly_points)
+
+    names = np.full((len(team_ids), max_players), "", dtype=object)
+    positions = np.full((len(team_ids), max_players), "", dtype=object)
+    points = np.full((len(team_ids), max_players, len(weeks)), -np.inf)
+    healthy_points = np.full((len(team_ids), max_players, len(weeks)), -np.inf)
+    for t, team_id in enumerate(team_ids):
+        rows = team_rows[team_id]
+        names[t, :len(rows)] = players_df["name"].to_numpy()[rows]
+        positions[t, :len(rows)] = players_df["position"].to_numpy()[rows]
+        points[t, :len(rows)] = player_points[rows]
+        healthy_points[t, :len(rows)] = player_healthy_points[rows]
+
+    return team_ids, names, positions, healthy_points, points
+
+def lineup_count_vectors(slots):
+    """Every number of starters per position the slots can hold, each with one slot assignment that holds it
+
+    Returns (counts, slot_positions): counts is vectors x LINEUP_POSITIONS, slot_positions is vectors x slot
+    instances with the index of the position each slot takes (-1 for a slot left empty).
+    """
+    slot_names = [slot for slot, count in slots for _ in range(count)]
+    states = {(0,) * len(LINEUP_POSITIONS): ()}
+    for slot in slot_names:
+        next_states = {}
+        for state, assignment in states.items():
+            next_states.setdefault(state, assignment + (-1,))
+            for position in SLOT_ELIGIBILITY[slot]:
+                p = LINEUP_POSITIONS.index(position)
+                next_state = state[:p] + (state[p] + 1,) + state[p + 1:]
+                next_states.setdefault(next_state, assignment + (p,))
+        states = next_states
+
+    counts = np.array(list(states.keys()), dtype=int).reshape(-1, len(LINEUP_POSITIONS))
+    slot_positions = np.array(list(states.values()), dtype=int).reshape(len(states), len(slot_names))
+    return counts, slot_positions
+
+def optimize_lineups(points, positions, slots):
+    """Optimal starting lineup for every team and week at once
+
+    points is teams x players x weeks, positions is teams x players. Returns (lineup_points, assignments):
+    lineup_points is teams x weeks, assignments is starting slots x teams x weeks of player indices (-1 if
+    the slot is left empty).
+    """
+    team_count, player_count, week_count = points.shape
+    counts, slot_positions = lineup_count_vectors(slots)
+    max_counts = counts.max(axis=0) if len(counts) else np.zeros(len(LINEUP_POSITIONS), dtype=int)
+    depth = max(int(max_counts.max()), 1) if len(counts) else 1
+
+    # Per position: players ordered best first, their points, and the points of the top k for every k
+    ranked_players = np.zeros((len(LINEUP_POSITIONS), team_count, depth, week_count), dtype=int)
+    ranked_points = np.full((len(LINEUP_POSITIONS), team_count, depth, week_count), -np.inf)
+    lineup_values = np.zeros((team_count, len(counts), week_count))
+    for p, position in enumerate(LINEUP_POSITIONS):
+        position_points = np.where((positions == position)[:, :, None], points, -np.inf)
+        order = np.argsort(-position_points, axis=1, kind="stable")[:, :depth]
+        top_points = np.take_along_axis(position_points, order, axis=1)
+        ranked_players[p, :, :order.shape[1]] = order
+        ranked_points[p, :, :order.shape[1]] = top_points
+
+        # A missing player is an empty slot worth 0, so the top-k sums are defined for every k
+        top_k_points = np.concatenate([np.zeros((team_count, 1, week_count)), np.cumsum(np.where(np.isfinite(top_points), top_points, 0.0), axis=1)], axis=1)
+        top_k_points = np.pad(top_k_points, ((0, 0), (0, depth + 1 - top_k_points.shape[1]), (0, 0)), mode="edge")
+        lineup_values += top_k_points[:, counts[:, p], :]
+
+    best = lineup_values.argmax(axis=1)
+    lineup_points = np.take_along_axis(lineup_values, best[:, None, :], axis=1)[:, 0, :]
+
+    # Slots given the same position take that position's players in rank order
+    slot_count = slot_positions.shape[1]
+    slot_ranks = np.zeros_like(slot_positions)
+    for j in range(slot_count):
+        slot_ranks[:, j] = (slot_positions[:, :j] == slot_positions[:, j:j + 1]).sum(axis=1)
+    slot_ranks[slot_positions < 0] = 0
+
+    team_index = np.arange(team_count)[:, None]
+    week_index = np.arange(week_count)[None, :]
+    assignments = np.full((slot_count, team_count, week_count), -1)
+    for j in range(slot_count):
+        position = slot_positions[best, j]
+        rank = slot_ranks[best, j]
+        filled_position = np.maximum(position, 0)
+        player = ranked_players[filled_position, team_index, rank, week_index]
+        filled = (position >= 0) & np.isfinite(ranked_points[filled_position, team_index, rank, week_index])
+        assignments[j] = np.where(filled, player, -1)
+    return lineup_points, assignments
+
+def plan_season_lineups(players_df, projection_matrix, weeks, bye_weeks, position_slot_counts=None):
+    """Optimal lineups for every team and remaining week, and how much byes cost each team each week"""
+    slots = starting_slots(position_slot_counts)
+    team_ids, names, positions, healthy_points, points = build_projection_arrays(players_df, projection_matrix, weeks, bye_weeks)
+
+    lineup_points, assignments = optimize_lineups(points, positions, slots)
+    full_strength_points, _ = optimize_lineups(healthy_points, positions, slots)
+
+    team_names = players_df.drop_duplicates(subset="team_id").set_index("team_id")["team_name"]
+    weekly_points_df = pd.DataFrame(lineup_points, index=team_names.reindex(team_ids).to_numpy(), columns=list(weeks))
+
+    bye_loss = full_strength_points - lineup_points
+    with np.errstate(divide="ignore", invalid="ignore"):
+        bye_loss_share = np.where(full_strength_points > 0, bye_loss / full_strength_points, 0.0)
+    crunch_teams, crunch_weeks = np.nonzero(bye_loss_share >= BYE_CRUNCH_THRESHOLD)
+    bye_crunch_df = pd.DataFrame({
+        "Team": weekly_points_df.index.to_numpy()[crunch_teams],
+        "Week": np.asarray(weeks)[crunch_weeks],
+        "Projected Points": lineup_points[crunch_teams, crunch_weeks].round(1),
+        "Full Strength Points": full_strength_points[crunch_teams, crunch_weeks].round(1),
+        "Points Lost to Byes": bye_loss[crunch_teams, crunch_weeks].round(1),
+        "Share Lost": bye_loss_share[crunch_teams, crunch_weeks],
+    }).sort_values(by="Points Lost to Byes", ascending=False).reset_index(drop=True)
+
+    slot_labels = [slot for slot, count in slots for _ in range(count)]
+    return {
+        "team_ids": team_ids,
+        "names": names,
+        "slot_labels": slot_labels,
+        "assignments": assignments,
+        "weekly_points": weekly_points_df,
+        "bye_crunch": bye_crunch_df,
+    }
+
+def team_lineup_table(plan, team_id, weeks):
+    """Starting lineup of one team as slots x weeks of player names"""
+    t = plan["team_ids"].index(team_id)
+    player_rows = plan["assignments"][:, t, :]
+    names = np.append(plan["names"][t], "(empty)")
+    # -1 (no eligible player) indexes the "(empty)" label appended at the end
+    return pd.DataFrame(names[player_rows], index=plan["slot_labels"], columns=[f"Week {week}" for week in weeks])
@@ -0,0 +1,142 @@
+import os
+import json
+import datetime
+import requests
+import pandas as pd
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.sleeper_loaders import LOADER_WORKERS, fetch_json
+from utils.game_timeline import build_week_games, build_team_game_index
+from utils.shared_cache import run_in_background, single_flight
+from utils.atomic_write import atomic_write
+
+# Local copy of the season's NFL schedule, one row per game, normalized once when it is fetched.
+# Weeks where every game is final never change again, so only unfinished weeks are fetched on refresh.
+ESPN_SCHEDULE_URL = "https://cdn.espn.com/core/nfl/schedule?xhr=1&year={year}&week={week}"
+NFL_REGULAR_SEASON_WEEKS = 18
+
+SCHEDULE_STORE_DIR = os.path.join("cache", "nfl_schedule")
+SCHEDULE_STORE_MAX_AGE = datetime.timedelta(hours=1)
+SCHEDULE_RETRY_INTERVAL = datetime.timedelta(minutes=5)  # How soon a refresh with failed weeks is retried
+
+def schedule_store_paths(year):
+    return os.path.join(SCHEDULE_STORE_DIR, f"{year}.parquet"), os.path.join(SCHEDULE_STORE_DIR, f"{year}.json")
+
+def fetch_week_games(year, week):
+    """Fetch and normalize one ESPN schedule week, returning (games_df, unparsed_short_names)"""
+    schedule_data = fetch_json(ESPN_SCHEDULE_URL.format(year=year, week=week))
+    games_df, unparsed_short_names = build_week_games(schedule_data["content"]["schedule"], "UTC")
+    games_df.insert(0, "week", week)
+    return games_df, unparsed_short_names
+
+def fetch_season_games(year, weeks):
+    """Fetch the given weeks concurrently, returning (games_df, unparsed_short_names, failed_weeks)"""
+    weeks = list(weeks)
+    frames = []
+    unparsed_short_names = []
+    failed_weeks = []
+    with ThreadPoolExecutor(max_workers=LOADER_WORKERS) as executor:
+        futures = {week: executor.submit(fetch_week_games, year, week) for week in weeks}
+        for week, future in futures.items():
+            try:
+                games_df, week_unparsed = future.result()
+            except (requests.RequestException, KeyError, ValueError):
+                failed_weeks.append(week)
+                continue
+            frames.append(games_df)
+            unparsed_short_names.extend(week_unparsed)
+
+    if frames:
+        games_df = pd.concat(frames, ignore_index=True)
+    else:
+        games_df = pd.DataFrame(columns=["week", "date_string", "game", "away_team", "home_team", "status", "game_time"])
+    return games_df, unparsed_short_names, failed_weeks
+
+def read_schedule_store(year):
+    store_path, meta_path = schedule_store_paths(year)
+    if not os.path.exists(store_path):
+        return None, {}
+    meta = {}
+    if os.path.exists(meta_path):
+        with open(meta_path) as meta_file:
+            meta = json.load(meta_file)
+    return pd.read_parquet(store_path), meta
+
+def weeks_to_refresh(stored_df, weeks):
+    """Weeks that are missing from the store or still have games that are not final"""
+    if stored_df is None or stored_df.empty:
+        return list(weeks)
+    final_weeks = stored_df.groupby("week")["status"].agg(lambda statuses: (statuses == "Final").all())
+    final_weeks = set(final_weeks[final_weeks].index)
+    return [week for week in weeks if week not in final_weeks]
+
+def refresh_schedule_store(year, weeks=range(1, NFL_REGULAR_SEASON_WEEKS + 1)):
+    """Fetch every unfinished week of the season concurrently and upsert it into the local store"""
+    stored_df, meta = read_schedule_store(year)
+    refresh_weeks = weeks_to_refresh(stored_df, weeks)
+    fetched_df, unparsed_short_names, failed_weeks = fetch_season_games(year, refresh_weeks)
+
+    # Weeks that failed to download keep their stored rows
+    if stored_df is not None:
+        fetched_weeks = set(refresh_weeks) - set(failed_weeks)
+        fetched_df = pd.concat([stored_df[~stored_df["week"].isin(fetched_weeks)], fetched_df], ignore_index=True)
+    season_df = fetched_df.sort_values(by=["week", "game_time"]).reset_index(drop=True)
+
+    store_path, meta_path = schedule_store_paths(year)
+    atomic_write(store_path, lambda temp_path: season_df.to_parquet(temp_path, index=False))
+
+    # A refresh with failed weeks only counts as fresh for the retry interval, so those weeks are fetched again soon
+    refreshed_at = datetime.datetime.now(datetime.timezone.utc)
+    if failed_weeks:
+        refreshed_at -= SCHEDULE_STORE_MAX_AGE - SCHEDULE_RETRY_INTERVAL
+    meta = {
+        "refreshed_at": refreshed_at.isoformat(),
+        "refreshed_weeks": refresh_weeks,
+        "failed_weeks": failed_weeks,
+        "unparsed_short_names": unparsed_short_names,
+    }
+    with open(meta_path, "w") as meta_file:
+        json.dump(meta, meta_file)
+    return season_df, meta
+
+def schedule_store_age(year):
+    """Time since the season's store was last refreshed, or None when it has never been"""
+    store_path, meta_path = schedule_store_paths(year)
+    if not os.path.exists(store_path) or not os.path.exists(meta_path):
+        return None
+    with open(meta_path) as meta_file:
+        refreshed_at = json.load(meta_file).get("refreshed_at")
+    if refreshed_at is None:
+        return None
+    return datetime.datetime.now(datetime.timezone.utc) - datetime.datetime.fromisoformat(refreshed_at)
+
+def refresh_schedule_store_if_stale(year, max_age=SCHEDULE_STORE_MAX_AGE):
+    # Only one process fetches the season, the others wait and then find the store fresh
+    with single_flight(f"nfl_schedule_{year}"):
+        age = schedule_store_age(year)
+        if age is None or age > max_age:
+            refresh_schedule_store(year)
+
+def load_season_games(year, timezone):
+    """The season's games with kickoff times in the given timezone, refreshed at most once an hour
+
+    A stale store is served while it refreshes in the background. Returns (games_df, unparsed_short_names).
+    """
+    age = schedule_store_age(year)
+    if age is None:
+        refresh_schedule_store_if_stale(year)
+    elif age > SCHEDULE_STORE_MAX_AGE:
+        run_in_background(f"nfl_schedule_{year}", lambda: refresh_schedule_store_if_stale(year))
+    season_df, meta = read_schedule_store(year)
+
+    season_df = season_df.copy()
+    season_df["game_time"] = pd.to_datetime(season_df["game_time"], utc=True).dt.tz_convert(timezone)
+    return season_df, meta.get("unparsed_short_names", [])
+
+def build_team_game_table(season_games_df):
+    """(week, team) -> game table, sorted so any week or range of weeks is an index slice"""
+    return build_team_game_index(season_games_df).set_index(["week", "team_key"]).sort_index()
+
+def games_in_weeks(team_game_table, first_week, last_week):
+    """Every (team, game) row for the weeks first_week..last_week, with team_key back as a column"""
+    return team_game_table.loc[first_week:last_week].reset_index()
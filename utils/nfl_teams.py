@@ -0,0 +1,88 @@
+# NFL team reference data shared by the ESPN and Sleeper pages.
+# Every data source names teams a little differently (FantasyPros uses "Philadelphia Eagles",
+# ESPN free agents use "Eagles D/ST", KTC uses "JAC" where Sleeper uses "JAX"), so all of the
+# known spellings are collected here and resolved to one canonical abbreviation.
+
+NFL_TEAMS = {
+    "ARI": {"city": "Arizona", "nickname": "Cardinals", "aliases": ["ARZ"]},
+    "ATL": {"city": "Atlanta", "nickname": "Falcons", "aliases": []},
+    "BAL": {"city": "Baltimore", "nickname": "Ravens", "aliases": ["BLT"]},
+    "BUF": {"city": "Buffalo", "nickname": "Bills", "aliases": []},
+    "CAR": {"city": "Carolina", "nickname": "Panthers", "aliases": []},
+    "CHI": {"city": "Chicago", "nickname": "Bears", "aliases": []},
+    "CIN": {"city": "Cincinnati", "nickname": "Bengals", "aliases": []},
+    "CLE": {"city": "Cleveland", "nickname": "Browns", "aliases": ["CLV"]},
+    "DAL": {"city": "Dallas", "nickname": "Cowboys", "aliases": []},
+    "DEN": {"city": "Denver", "nickname": "Broncos", "aliases": []},
+    "DET": {"city": "Detroit", "nickname": "Lions", "aliases": []},
+    "GB": {"city": "Green Bay", "nickname": "Packers", "aliases": ["GBP"]},
+    "HOU": {"city": "Houston", "nickname": "Texans", "aliases": ["HST"]},
+    "IND": {"city": "Indianapolis", "nickname": "Colts", "aliases": []},
+    "JAX": {"city": "Jacksonville", "nickname": "Jaguars", "aliases": ["JAC"]},
+    "KC": {"city": "Kansas City", "nickname": "Chiefs", "aliases": ["KCC"]},
+    "LAC": {"city": "Los Angeles", "nickname": "Chargers", "aliases": ["SD"]},
+    "LAR": {"city": "Los Angeles", "nickname": "Rams", "aliases": ["LA", "STL"]},
+    "LV": {"city": "Las Vegas", "nickname": "Raiders", "aliases": ["LVR", "OAK"]},
+    "MIA": {"city": "Miami", "nickname": "Dolphins", "aliases": []},
+    "MIN": {"city": "Minnesota", "nickname": "Vikings", "aliases": []},
+    "NE": {"city": "New England", "nickname": "Patriots", "aliases": ["NEP"]},
+    "NO": {"city": "New Orleans", "nickname": "Saints", "aliases": ["NOS"]},
+    "NYG": {"city": "New York", "nickname": "Giants", "aliases": []},
+    "NYJ": {"city": "New York", "nickname": "Jets", "aliases": []},
+    "PHI": {"city": "Philadelphia", "nickname": "Eagles", "aliases": []},
+    "PIT": {"city": "Pittsburgh", "nickname": "Steelers", "aliases": []},
+    "SF": {"city": "San Francisco", "nickname": "49ers", "aliases": ["SFO"]},
+    "SEA": {"city": "Seattle", "nickname": "Seahawks", "aliases": []},
+    "TB": {"city": "Tampa Bay", "nickname": "Buccaneers", "aliases": ["TBB"]},
+    "TEN": {"city": "Tennessee", "nickname": "Titans", "aliases": []},
+    "WAS": {"city": "Washington", "nickname": "Commanders", "aliases": ["WSH"]},
+}
+
+def normalize_team_key(name):
+    """Normalize a team name or abbreviation for alias lookups"""
+    return " ".join(str(name).replace(" D/ST", "").replace(".", "").split()).lower()
+
+def build_team_alias_index(teams=NFL_TEAMS):
+    """Build a dictionary of every known team alias -> canonical abbreviation"""
+    city_counts = {}
+    for info in teams.values():
+        city_counts[info["city"]] = city_counts.get(info["city"], 0) + 1
+
+    index = {}
+    for abbreviation, info in teams.items():
+        aliases = [
+            abbreviation,
+            info["nickname"],
+            f"{info['city']} {info['nickname']}",
+            *info["aliases"],
+        ]
+        # Cities shared by two teams (Los Angeles, New York) are ambiguous, so they are not aliases
+        if city_counts[info["city"]] == 1:
+            aliases.append(info["city"])
+        for alias in aliases:
+            index[normalize_team_key(alias)] = abbreviation
+    return index
+
+TEAM_ALIAS_INDEX = build_team_alias_index()
+
+def resolve_team(name):
+    """Resolve any team name, nickname, city or abbreviation to its canonical abbreviation, or None"""
+    if name is None:
+        return None
+    return TEAM_ALIAS_INDEX.get(normalize_team_key(name))
+
+def canonical_team_abbreviation(abbreviation):
+    """Canonicalize a team abbreviation, falling back to the upper-cased input for unknown teams (e.g. "FA")"""
+    if not isinstance(abbreviation, str) or not abbreviation.strip():
+        return None
+    return resolve_team(abbreviation) or str(abbreviation).strip().upper()
+
+def build_dst_index(combined_data):
+    """Map canonical team abbreviation -> DST player name in the combined FantasyPros data"""
+    dst_players = combined_data.loc[combined_data["POS"] == "DST", "Player"]
+    dst_index = {}
+    for player in dst_players:
+        abbreviation = resolve_team(player)
+        if abbreviation is not None:
+            dst_index.setdefault(abbreviation, player)
+    return dst_index
@@ -0,0 +1,143 @@
+import numpy as np
+import pandas as pd
+from concurrent.futures import ProcessPoolExecutor
+
+# Monte Carlo playoff odds for a Sleeper league. Each simulation draws every team's remaining weekly
+# scores from a normal distribution fit to its scores so far, plays out the remaining schedule and seeds
+# the league by wins, then points for. All simulations in a chunk are computed at once as arrays.
+
+DEFAULT_SIMULATIONS = 50000
+SIMULATION_CHUNK_SIZE = 10000
+
+# Weeks of history before a team's own score spread is trusted over the league-wide spread
+SCORE_SHRINKAGE_WEEKS = 4
+DEFAULT_WEEKLY_MEAN = 110.0
+DEFAULT_WEEKLY_STD = 25.0
+
+def matchup_pairs(week_matchups):
+    """(roster_id, roster_id) pairs playing each other in one week of Sleeper matchups"""
+    rosters_by_matchup = {}
+    for matchup in week_matchups or []:
+        if matchup.get("matchup_id") is not None:
+            rosters_by_matchup.setdefault(matchup["matchup_id"], []).append(matchup["roster_id"])
+    return [tuple(roster_ids) for roster_ids in rosters_by_matchup.values() if len(roster_ids) == 2]
+
+def build_season_arrays(matchups_by_week, roster_ids, current_week, last_regular_season_week):
+    """Split the season into completed scores and remaining games
+
+    Returns (points, remaining_games), where points is a completed weeks x teams array (NaN when a team did
+    not play) and remaining_games is a (games, 3) array of (week offset, team index, opponent index).
+    """
+    team_index = {roster_id: i for i, roster_id in enumerate(roster_ids)}
+    completed_weeks = [week for week in range(1, current_week) if week in matchups_by_week]
+
+    points = np.full((len(completed_weeks), len(roster_ids)), np.nan)
+    for row, week in enumerate(completed_weeks):
+        for matchup in matchups_by_week[week] or []:
+            if matchup["roster_id"] in team_index and matchup.get("points") is not None:
+                points[row, team_index[matchup["roster_id"]]] = matchup["points"]
+
+    remaining_games = [
+        (week - current_week, team_index[first], team_index[second])
+        for week in range(current_week, last_regular_season_week + 1)
+        for first, second in matchup_pairs(matchups_by_week.get(week))
+        if first in team_index and second in team_index
+    ]
+    return points, np.array(remaining_games, dtype=np.int64).reshape(-1, 3)
+
+def team_score_distributions(points):
+    """Per-team weekly score mean and standard deviation, shrunk toward the league for short histories"""
+    team_count = points.shape[1]
+    played = np.sum(~np.isnan(points), axis=0)
+    if not played.any():
+        return np.full(team_count, DEFAULT_WEEKLY_MEAN), np.full(team_count, DEFAULT_WEEKLY_STD)
+
+    league_mean = np.nanmean(points)
+    league_std = np.nanstd(points) if np.sum(played) > 1 else DEFAULT_WEEKLY_STD
+    # Computed from sums so teams without a score yet do not raise all-NaN warnings
+    team_mean = np.where(played > 0, np.nansum(points, axis=0) / np.maximum(played, 1), league_mean)
+    team_variance = np.nansum((points - team_mean) ** 2, axis=0) / np.maximum(played, 1)
+    team_std = np.where(played > 1, np.sqrt(team_variance), league_std)
+
+    weight = played / (played + SCORE_SHRINKAGE_WEEKS)
+    means = weight * team_mean + (1 - weight) * league_mean
+    stds = weight * team_std + (1 - weight) * league_std
+    return means, np.maximum(stds, 1.0)
+
+def _simulate_chunk(args):
+    """Seed counts (teams x seeds) for one chunk of simulations, run as one block of arrays"""
+    wins, points_for, means, stds, remaining_games, simulations, seed = args
+    rng = np.random.default_rng(seed)
+    team_count = len(wins)
+    week_count = int(remaining_games[:, 0].max()) + 1 if len(remaining_games) else 0
+
+    # simulations x remaining weeks x teams
+    scores = rng.normal(means, stds, size=(simulations, week_count, team_count)).astype(np.float32)
+
+    weeks, teams, opponents = remaining_games[:, 0], remaining_games[:, 1], remaining_games[:, 2]
+    team_scores = scores[:, weeks, teams]
+    opponent_scores = scores[:, weeks, opponents]
+    team_won = (team_scores > opponent_scores).astype(np.float32)
+
+    # Games x teams incidence matrices turn per-game results into per-team totals with one matrix product
+    team_incidence = np.zeros((len(remaining_games), team_count), dtype=np.float32)
+    opponent_incidence = np.zeros((len(remaining_games), team_count), dtype=np.float32)
+    team_incidence[np.arange(len(remaining_games)), teams] = 1
+    opponent_incidence[np.arange(len(remaining_games)), opponents] = 1
+
+    final_wins = wins + team_won @ team_incidence + (1 - team_won) @ opponent_incidence
+    final_points = points_for + team_scores @ team_incidence + opponent_scores @ opponent_incidence
+
+    # Seed by wins, then points for (points for is far below the 1e6 gap between a win)
+    order = np.argsort(-(final_wins.astype(np.float64) * 1e6 + final_points), axis=1)
+    # order[s, k] is the team seeded k + 1 in simulation s, counted as team * team_count + seed
+    seed_counts = np.bincount((order * team_count + np.arange(team_count)).ravel(), minlength=team_count * team_count)
+    return seed_counts.reshape(team_count, team_count), final_wins.sum(axis=0, dtype=np.float64)
+
+def simulate_seed_counts(wins, points_for, means, stds, remaining_games, simulations=DEFAULT_SIMULATIONS, processes=None, seed=None):
+    """Run the simulations in chunks, on a process pool when processes > 1
+
+    Returns (seed_counts, total_wins): how often each team finished in each seed, and its wins summed over all simulations.
+    """
+    chunk_sizes = [SIMULATION_CHUNK_SIZE] * (simulations // SIMULATION_CHUNK_SIZE)
+    if simulations % SIMULATION_CHUNK_SIZE:
+        chunk_sizes.append(simulations % SIMULATION_CHUNK_SIZE)
+    # Independent random streams per chunk, so the result does not depend on how chunks are scheduled
+    chunk_seeds = np.random.SeedSequence(seed).spawn(len(chunk_sizes))
+    chunks = [
+        (np.asarray(wins, dtype=np.float32), np.asarray(points_for, dtype=np.float32), means, stds, remaining_games, size, chunk_seed)
+        for size, chunk_seed in zip(chunk_sizes, chunk_seeds)
+    ]
+
+    if processes and processes > 1 and len(chunks) > 1:
+        with ProcessPoolExecutor(max_workers=processes) as executor:
+            results = list(executor.map(_simulate_chunk, chunks))
+    else:
+        results = [_simulate_chunk(chunk) for chunk in chunks]
+
+    seed_counts = sum(result[0] for result in results)
+    total_wins = sum(result[1] for result in results)
+    return seed_counts, total_wins
+
+def playoff_odds(rosters, team_names, matchups_by_week, current_week, last_regular_season_week, playoff_teams, simulations=DEFAULT_SIMULATIONS, processes=None, seed=None):
+    """Playoff and seed probabilities for every team in a Sleeper league, best odds first"""
+    roster_ids = [roster["roster_id"] for roster in rosters]
+    wins = np.array([roster["settings"].get("wins", 0) for roster in rosters], dtype=float)
+    points_for = np.array([roster["settings"].get("fpts", 0) + roster["settings"].get("fpts_decimal", 0) / 100 for roster in rosters], dtype=float)
+
+    points, remaining_games = build_season_arrays(matchups_by_week, roster_ids, current_week, last_regular_season_week)
+    means, stds = team_score_distributions(points)
+    seed_counts, total_wins = simulate_seed_counts(wins, points_for, means, stds, remaining_games, simulations, processes, seed)
+
+    seed_probabilities = seed_counts / simulations
+    odds_df = pd.DataFrame({
+        "Team Name": [team_names.get(roster["owner_id"], f"Roster {roster['roster_id']}") for roster in rosters],
+        "Record": [f"{roster['settings'].get('wins', 0)}-{roster['settings'].get('losses', 0)}" for roster in rosters],
+        "Weekly Score Mean": means.round(1),
+        "Weekly Score Std": stds.round(1),
+        "Projected Wins": (total_wins / simulations).round(2),
+        "Playoff %": seed_probabilities[:, :playoff_teams].sum(axis=1),
+    })
+    for seed_number in range(min(playoff_teams, len(rosters))):
+        odds_df[f"Seed {seed_number + 1} %"] = seed_probabilities[:, seed_number]
+    return odds_df.sort_values(by=["Playoff %", "Projected Wins"], ascending=False).reset_index(drop=True)
@@ -0,0 +1,62 @@
+import os
+import re
+import pstats
+import cProfile
+import datetime
+import pandas as pd
+from contextlib import contextmanager
+
+# Function-level profile of a page run, switched on without code changes: ?profile=1 in the URL or
+# FF_PROFILE=1. Each profiled run writes a pstats file (readable with `python -m pstats`, snakeviz or
+# `python cli.py profile-report`) to FF_PROFILE_DIR, cache/profiles by default. cProfile only sees the
+# script thread, so work on pool threads shows up as time spent waiting on the pool.
+
+PROFILE_ENV_VAR = "FF_PROFILE"
+PROFILE_DIR_ENV_VAR = "FF_PROFILE_DIR"
+PROFILE_QUERY_PARAM = "profile"
+DEFAULT_PROFILE_DIR = os.path.join("cache", "profiles")
+
+PROFILE_REPORT_LIMIT = 25
+
+def profiling_requested(query_params):
+    return query_params.get(PROFILE_QUERY_PARAM) == "1" or os.environ.get(PROFILE_ENV_VAR) == "1"
+
+def profile_path(page_title, profile_dir=None, now=None):
+    """Timestamped pstats path for one run of a page"""
+    profile_dir = profile_dir or os.environ.get(PROFILE_DIR_ENV_VAR) or DEFAULT_PROFILE_DIR
+    now = now or datetime.datetime.now()
+    page_slug = re.sub(r"[^a-z0-9]+", "_", page_title.lower()).strip("_")
+    return os.path.join(profile_dir, f"{now.strftime('%Y%m%d-%H%M%S-%f')}-{page_slug}.pstats")
+
+@contextmanager
+def profiled(page_title, profile_dir=None):
+    """Profile the block and write a pstats file, also when the block raises (e.g. st.stop)
+
+    Yields a dict that holds the file's path under "path" once the block is done.
+    """
+    profile = {}
+    profiler = cProfile.Profile()
+    profiler.enable()
+    try:
+        yield profile
+    finally:
+        profiler.disable()
+        path = profile_path(page_title, profile_dir)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        profiler.dump_stats(path)
+        profile["path"] = path
+
+def top_functions(path, limit=PROFILE_REPORT_LIMIT):
+    """The functions with the most cumulative time in a pstats file"""
+    stats = pstats.Stats(path).stats
+    rows = [
+        {
+            "Function": f"{function_name} ({os.path.basename(file_name)}:{line_number})",
+            "Calls": total_calls,
+            "Own Seconds": own_time,
+            "Cumulative Seconds": cumulative_time,
+        }
+        for (file_name, line_number, function_name), (_, total_calls, own_time, cumulative_time, _) in stats.items()
+    ]
+    profile_df = pd.DataFrame(rows, columns=["Function", "Calls", "Own Seconds", "Cumulative Seconds"])
+    return profile_df.sort_values(by="Cumulative Seconds", ascending=False).head(limit).reset_index(drop=True)
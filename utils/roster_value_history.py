@@ -0,0 +1,170 @@
+import os
+import sqlite3
+from contextlib import contextmanager
+import pandas as pd
+
+# Daily per-team KTC totals for every Sleeper league the app loads, in a local SQLite file.
+# A team only gets a new row when its values change, so a quiet week costs nothing, and the value
+# on any date is the team's latest row on or before it (an index seek on the primary key).
+HISTORY_DB_PATH = os.path.join("cache", "roster_values.sqlite")
+
+VALUE_COLUMNS = ["team_name", "player_value", "pick_value", "total_value", "num_players", "num_picks"]
+
+# Column names of the Roster Comparison table (Sleeper page and league batch) -> snapshot columns
+COMPARISON_COLUMNS = {
+    "Owner ID": "owner_id",
+    "Team Name": "team_name",
+    "Player KTC Value": "player_value",
+    "Draft Picks KTC Value": "pick_value",
+    "Total KTC Value": "total_value",
+    "Number of Players": "num_players",
+    "Number of Draft Picks": "num_picks",
+}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS roster_values (
+    league_id TEXT NOT NULL,
+    owner_id TEXT NOT NULL,
+    snapshot_date TEXT NOT NULL,
+    team_name TEXT,
+    player_value REAL NOT NULL,
+    pick_value REAL NOT NULL,
+    total_value REAL NOT NULL,
+    num_players INTEGER,
+    num_picks INTEGER,
+    PRIMARY KEY (league_id, owner_id, snapshot_date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS roster_values_by_date ON roster_values (league_id, snapshot_date);
+"""
+
+def connect(db_path=HISTORY_DB_PATH):
+    os.makedirs(os.path.dirname(db_path), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    conn.executescript(SCHEMA)
+    return conn
+
+@contextmanager
+def open_history(db_path=HISTORY_DB_PATH):
+    """Connection that commits on success and is always closed"""
+    conn = connect(db_path)
+    try:
+        with conn:
+            yield conn
+    finally:
+        conn.close()
+
+def build_snapshot_rows(league_id, comparison_df):
+    """Snapshot rows from a Roster Comparison table"""
+    rows = comparison_df[list(COMPARISON_COLUMNS)].rename(columns=COMPARISON_COLUMNS)
+    rows[["player_value", "pick_value", "total_value"]] = rows[["player_value", "pick_value", "total_value"]].astype(float).round(1)
+    rows[["num_players", "num_picks"]] = rows[["num_players", "num_picks"]].astype(int)
+    rows.insert(0, "league_id", str(league_id))
+    return rows
+
+def latest_values(conn, league_id):
+    """Each team's most recent stored row in a league, indexed by owner_id"""
+    latest_df = pd.read_sql_query(
+        """
+        SELECT r.owner_id, r.snapshot_date, r.team_name, r.player_value, r.pick_value, r.total_value, r.num_players, r.num_picks
+        FROM roster_values r
+        WHERE r.league_id = ? AND r.snapshot_date = (
+            SELECT MAX(snapshot_date) FROM roster_values WHERE league_id = r.league_id AND owner_id = r.owner_id
+        )
+        """,
+        conn,
+        params=(str(league_id),),
+    )
+    return latest_df.set_index("owner_id")
+
+def record_snapshot(league_id, comparison_df, snapshot_date, db_path=HISTORY_DB_PATH):
+    """Store the day's values for every team whose values differ from its latest stored row
+
+    Returns the number of rows written. Running it again with the same values writes nothing.
+    """
+    rows = build_snapshot_rows(league_id, comparison_df)
+    snapshot_date = str(snapshot_date)
+
+    with open_history(db_path) as conn:
+        latest_df = latest_values(conn, league_id)
+        stored = latest_df.reindex(rows["owner_id"])[VALUE_COLUMNS].reset_index(drop=True)
+        unchanged = (stored.fillna(-1).to_numpy() == rows[VALUE_COLUMNS].reset_index(drop=True).fillna(-1).to_numpy()).all(axis=1)
+        changed_rows = rows[~unchanged]
+        if changed_rows.empty:
+            return 0
+
+        conn.executemany(
+            """
+            INSERT INTO roster_values (league_id, owner_id, snapshot_date, team_name, player_value, pick_value, total_value, num_players, num_picks)
+            VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ON CONFLICT (league_id, owner_id, snapshot_date) DO UPDATE SET
+                team_name = excluded.team_name,
+                player_value = excluded.player_value,
+                pick_value = excluded.pick_value,
+                total_value = excluded.total_value,
+                num_players = excluded.num_players,
+                num_picks = excluded.num_picks
+            """,
+            [
+                (row.league_id, row.owner_id, snapshot_date, row.team_name, row.player_value, row.pick_value, row.total_value, row.num_players, row.num_picks)
+                for row in changed_rows.itertuples(index=False)
+            ],
+        )
+    return len(changed_rows)
+
+def team_value_history(league_id, start_date=None, end_date=None, db_path=HISTORY_DB_PATH):
+    """Daily total value per team (date x team name), with the days between stored rows filled forward"""
+    if not os.path.exists(db_path):
+        return pd.DataFrame()
+    with open_history(db_path) as conn:
+        history_df = pd.read_sql_query(
+            "SELECT owner_id, snapshot_date, team_name, total_value FROM roster_values WHERE league_id = ? ORDER BY snapshot_date",
+            conn,
+            params=(str(league_id),),
+        )
+    if history_df.empty:
+        return pd.DataFrame()
+
+    history_df["snapshot_date"] = pd.to_datetime(history_df["snapshot_date"])
+    # Label every team by its most recent name
+    latest_names = history_df.groupby("owner_id")["team_name"].last()
+    daily_df = history_df.pivot(index="snapshot_date", columns="owner_id", values="total_value")
+    daily_df = daily_df.reindex(pd.date_range(daily_df.index.min(), end_date or daily_df.index.max(), freq="D")).ffill()
+    daily_df.columns = latest_names.reindex(daily_df.columns).to_numpy()
+    if start_date is not None:
+        daily_df = daily_df[daily_df.index >= pd.Timestamp(start_date)]
+    return daily_df
+
+def value_change_since(league_id, since_date, db_path=HISTORY_DB_PATH):
+    """Each team's value change from since_date to its latest snapshot, biggest gain first"""
+    if not os.path.exists(db_path):
+        return pd.DataFrame()
+    with open_history(db_path) as conn:
+        latest_df = latest_values(conn, league_id)
+        # Value as of since_date is the team's latest row on or before it
+        since_df = pd.read_sql_query(
+            """
+            SELECT r.owner_id, r.total_value
+            FROM roster_values r
+            WHERE r.league_id = ? AND r.snapshot_date = (
+                SELECT MAX(snapshot_date) FROM roster_values WHERE league_id = r.league_id AND owner_id = r.owner_id AND snapshot_date <= ?
+            )
+            """,
+            conn,
+            params=(str(league_id), str(since_date)),
+        ).set_index("owner_id")
+
+    change_df = pd.DataFrame({
+        "Team Name": latest_df["team_name"],
+        "Value Then": since_df["total_value"].reindex(latest_df.index),
+        "Value Now": latest_df["total_value"],
+    })
+    change_df["Change"] = change_df["Value Now"] - change_df["Value Then"]
+    change_df["Change %"] = change_df["Change"] / change_df["Value Then"]
+    return change_df.sort_values(by="Change", ascending=False).reset_index(drop=True)
+
+def record_batch_snapshot(comparison_df, snapshot_date, db_path=HISTORY_DB_PATH):
+    """Snapshot every league in a league batch comparison table"""
+    return sum(
+        record_snapshot(league_id, league_df, snapshot_date, db_path=db_path)
+        for league_id, league_df in comparison_df.groupby("League ID", sort=False)
+    )
@@ -0,0 +1,139 @@
+import os
+import time
+import pickle
+import hashlib
+import functools
+import threading
+from contextlib import contextmanager
+
+from utils.atomic_write import atomic_write
+
+try:
+    import fcntl
+except ImportError:  # Windows: requests are still coalesced within a process, not across processes
+    fcntl = None
+
+# Disk-backed cache shared by every Streamlit process (and the CLI) on the machine. st.cache_data is
+# per process, so after a TTL expiry each process would otherwise start its own KTC scrape or Sleeper
+# download. Here the first caller takes a file lock and does the work; everyone else waits on the lock
+# and then reads the result it wrote. The same locks keep background refreshes from running twice.
+
+SHARED_CACHE_DIR = os.path.join("cache", "shared")
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+def _thread_lock(name):
+    # flock is per open file, so threads of one process are also coalesced with a plain lock
+    with _thread_locks_guard:
+        return _thread_locks.setdefault(name, threading.Lock())
+
+@contextmanager
+def single_flight(name):
+    """Hold the lock for one unit of work, across threads and processes"""
+    os.makedirs(SHARED_CACHE_DIR, exist_ok=True)
+    with _thread_lock(name):
+        with open(os.path.join(SHARED_CACHE_DIR, f"{name}.lock"), "a") as lock_file:
+            if fcntl is not None:
+                fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+def cache_key(name, args, kwargs):
+    arguments = repr((args, sorted(kwargs.items())))
+    return f"{name}-{hashlib.sha1(arguments.encode()).hexdigest()[:16]}"
+
+def _cache_path(key):
+    return os.path.join(SHARED_CACHE_DIR, f"{key}.pkl")
+
+def cache_age(key):
+    """Seconds since key was last written, or None when it has never been cached"""
+    try:
+        return time.time() - os.path.getmtime(_cache_path(key))
+    except OSError:
+        return None
+
+def _read(path):
+    try:
+        with open(path, "rb") as cache_file:
+            return pickle.load(cache_file)
+    except (OSError, EOFError, pickle.UnpicklingError):
+        return None
+
+def _dump(value, path):
+    with open(path, "wb") as cache_file:
+        pickle.dump(value, cache_file, protocol=pickle.HIGHEST_PROTOCOL)
+
+def _write(path, value):
+    atomic_write(path, lambda temp_path: _dump(value, temp_path))
+
+_background_names = set()
+
+def run_in_background(name, work):
+    """Run work on a daemon thread unless this process is already running work under that name"""
+    with _thread_locks_guard:
+        if name in _background_names:
+            return False
+        _background_names.add(name)
+
+    def run():
+        try:
+            work()
+        finally:
+            with _thread_locks_guard:
+                _background_names.discard(name)
+
+    threading.Thread(target=run, name=f"refresh-{name}", daemon=True).start()
+    return True
+
+def refresh_entry(key, compute, max_age):
+    """Compute and store key, unless another caller renewed it within max_age seconds while we waited"""
+    with single_flight(key):
+        age = cache_age(key)
+        if age is not None and age <= max_age:
+            value = _read(_cache_path(key))
+            if value is not None:
+                return value
+        value = compute()
+        _write(_cache_path(key), value)
+        return value
+
+def get_or_compute(key, ttl, compute, stale_while_revalidate=False):
+    """Cached value for key, computed by exactly one caller when it is missing or expired
+
+    With stale_while_revalidate, an expired value is returned at once and renewed on a background
+    thread, so only a cold cache makes the caller wait.
+    """
+    age = cache_age(key)
+    if age is not None:
+        value = _read(_cache_path(key))
+        if value is not None:
+            if age <= ttl:
+                return value
+            if stale_while_revalidate:
+                run_in_background(key, lambda: refresh_entry(key, compute, ttl))
+                return value
+    return refresh_entry(key, compute, ttl)
+
+def shared_cache(ttl, stale_while_revalidate=False):
+    """Decorator caching a loader's result on disk for ttl seconds, keyed on its arguments
+
+    Meant to sit under @st.cache_data, which keeps serving from memory within a process.
+    Results must be picklable and not None. The wrapper also has cache_age(*args) and
+    refresh(max_age, *args), which renews the value unless it is younger than max_age seconds.
+    """
+    def decorator(func):
+        def key_for(args, kwargs):
+            return cache_key(func.__qualname__, args, kwargs)
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            return get_or_compute(key_for(args, kwargs), ttl, lambda: func(*args, **kwargs), stale_while_revalidate)
+
+        wrapper.cache_age = lambda *args, **kwargs: cache_age(key_for(args, kwargs))
+        wrapper.refresh = lambda max_age, *args, **kwargs: refresh_entry(key_for(args, kwargs), lambda: func(*args, **kwargs), max_age)
+        return wrapper
+    return decorator
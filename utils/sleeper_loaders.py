@@ -0,0 +1,112 @@
+import streamlit as st
+import requests
+from requests.adapters import HTTPAdapter
+from concurrent.futures import ThreadPoolExecutor
+
+from utils.shared_cache import shared_cache
+
+SLEEPER_API_URL = "https://api.sleeper.app/v1"
+
+LOADER_WORKERS = 8
+
+_http_session = None
+
+def get_http_session():
+    """Shared requests session, so concurrent loaders reuse pooled keep-alive connections"""
+    global _http_session
+    if _http_session is None:
+        session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=LOADER_WORKERS, pool_maxsize=LOADER_WORKERS)
+        session.mount("https://", adapter)
+        _http_session = session
+    return _http_session
+
+def fetch_json(url):
+    resp = get_http_session().get(url, timeout=30)
+    resp.raise_for_status()
+    return resp.json()
+
+# Each endpoint gets its own TTL: rosters change with every add/drop, users and picks rarely do.
+# The loaders run on worker threads, so no spinner is shown. The league loaders are also cached on
+# disk, so a league opened from several app processes is only fetched once per TTL.
+
+@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
+@shared_cache(ttl=3600)
+def get_league(league_id):
+    return fetch_json(f"{SLEEPER_API_URL}/league/{league_id}")
+
+@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
+@shared_cache(ttl=3600)
+def get_league_users(league_id):
+    return fetch_json(f"{SLEEPER_API_URL}/league/{league_id}/users")
+
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
+@shared_cache(ttl=300)
+def get_league_rosters(league_id):
+    return fetch_json(f"{SLEEPER_API_URL}/league/{league_id}/rosters")
+
+@st.cache_data(ttl=3600, show_spinner=False)  # Cache for 1 hour
+@shared_cache(ttl=3600)
+def get_league_traded_picks(league_id):
+    return fetch_json(f"{SLEEPER_API_URL}/league/{league_id}/traded_picks")
+
+@st.cache_data(ttl=300, show_spinner=False)  # Cache for 5 minutes
+@shared_cache(ttl=300)
+def get_league_matchups(league_id, week):
+    return fetch_json(f"{SLEEPER_API_URL}/league/{league_id}/matchups/{week}")
+
+def get_season_matchups(league_id, last_week):
+    """Matchups for weeks 1..last_week, fetched concurrently, as {week: matchups}"""
+    weeks = range(1, last_week + 1)
+    with ThreadPoolExecutor(max_workers=LOADER_WORKERS) as executor:
+        return dict(zip(weeks, executor.map(lambda week: get_league_matchups(league_id, week), weeks)))
+
+@st.cache_data(ttl=900, show_spinner=False)  # Cache for 15 minutes
+def get_nfl_state():
+    resp = get_http_session().get(f"{SLEEPER_API_URL}/state/nfl", timeout=30)
+    if resp.status_code == 200:
+        return resp.json()
+    return None
+
+def user_team_name(user):
+    """A user's team name, or their display name when they have not set one, as Sleeper shows it"""
+    return (user.get("metadata") or {}).get("team_name") or user["display_name"]
+
+def get_standings(rosters, users):
+    """Standings as (team_name, wins, losses, points) tuples, the same shape as sleeper_wrapper's League.get_standings
+
+    Computed locally from rosters and users, so no League object (and its extra request) is needed.
+    """
+    team_name_by_user_id = {}
+    for user in users:
+        team_name_by_user_id[user["user_id"]] = user_team_name(user)
+
+    roster_standings_list = []
+    for roster in rosters:
+        settings = roster["settings"]
+        owner_id = roster["owner_id"]
+        roster_standings_list.append((settings["wins"], settings["losses"], settings["fpts"], team_name_by_user_id.get(owner_id) if owner_id is not None else None))
+    roster_standings_list.sort(key=lambda item: item[:3], reverse=True)
+
+    return [(item[3], str(item[0]), str(item[1]), str(item[2])) for item in roster_standings_list]
+
+def load_sleeper_page_data(league_id):
+    """Issue every independent request the Sleeper page needs at once
+
+    Time to first render is the slowest single call instead of the total.
+    The NFL schedule is loaded separately, for the whole season, by utils.nfl_schedule.
+    """
+    with ThreadPoolExecutor(max_workers=LOADER_WORKERS) as executor:
+        league_future = executor.submit(get_league, league_id)
+        users_future = executor.submit(get_league_users, league_id)
+        rosters_future = executor.submit(get_league_rosters, league_id)
+        traded_picks_future = executor.submit(get_league_traded_picks, league_id)
+        nfl_state_future = executor.submit(get_nfl_state)
+
+        return {
+            "league": league_future.result(),
+            "users": users_future.result(),
+            "rosters": rosters_future.result(),
+            "traded_picks": traded_picks_future.result(),
+            "nfl_state": nfl_state_future.result(),
+        }
@@ -0,0 +1,150 @@
+import os
+import json
+import datetime
+import pandas as pd
+import pyarrow.parquet as pq
+
+from utils.shared_cache import run_in_background, single_flight
+from utils.atomic_write import atomic_write
+
+# Local, column-pruned copy of Sleeper's all-players database (~10k players), indexed by player_id.
+# The raw endpoint returns a large nested JSON document; only the columns the app uses are kept.
+PLAYERS_STORE_PATH = os.path.join("cache", "sleeper_players.parquet")
+PLAYERS_STORE_META_PATH = os.path.join("cache", "sleeper_players.json")
+
+PLAYERS_STORE_MAX_AGE = datetime.timedelta(days=1)
+
+STRING_COLUMNS = ["search_first_name", "search_last_name", "first_name", "last_name", "full_name", "status", "injury_status"]
+CATEGORY_COLUMNS = ["position", "team"]
+FLOAT_COLUMNS = ["number", "age", "years_exp", "depth_chart_order"]
+LIST_COLUMNS = ["fantasy_positions"]
+PLAYER_COLUMNS = STRING_COLUMNS + CATEGORY_COLUMNS + FLOAT_COLUMNS + LIST_COLUMNS
+
+def players_to_frame(all_players):
+    """Convert the raw Sleeper players dict into a typed, column-pruned frame indexed by player_id"""
+    records = {
+        player_id: {column: player.get(column) for column in PLAYER_COLUMNS}
+        for player_id, player in all_players.items()
+        if player
+    }
+    players_df = pd.DataFrame.from_dict(records, orient="index", columns=PLAYER_COLUMNS)
+    players_df.index = players_df.index.astype(str)
+    players_df.index.name = "player_id"
+    return compact_players_frame(players_df)
+
+def compact_players_frame(players_df):
+    """Apply the store's dtypes to whichever of its columns are present, leaving columns that already have them untouched"""
+    for column in players_df.columns.intersection(STRING_COLUMNS):
+        if players_df[column].dtype != "string":
+            players_df[column] = players_df[column].astype("string")
+    for column in players_df.columns.intersection(CATEGORY_COLUMNS):
+        if players_df[column].dtype != "category":
+            players_df[column] = players_df[column].astype("category")
+    for column in players_df.columns.intersection(FLOAT_COLUMNS):
+        if players_df[column].dtype != "float32":
+            players_df[column] = pd.to_numeric(players_df[column], errors="coerce").astype("float32")
+    return players_df
+
+def _join_positions(positions):
+    # fantasy_positions is a list when fetched and a numpy array when read back from Parquet
+    if positions is None or isinstance(positions, float):
+        return ""
+    return ",".join(positions)
+
+def _row_signature(players_df):
+    # Lists/arrays are not hashable, so compare a flat string form of each row
+    signature_df = players_df.astype({column: str for column in PLAYER_COLUMNS if column not in LIST_COLUMNS})
+    for column in LIST_COLUMNS:
+        signature_df[column] = players_df[column].map(_join_positions)
+    return signature_df[PLAYER_COLUMNS].agg("|".join, axis=1)
+
+def merge_players(stored_df, fetched_df):
+    """Upsert fetched players into the stored frame, returning (merged_df, change counts)"""
+    if stored_df is None:
+        return fetched_df, {"added": len(fetched_df), "updated": 0, "removed": 0}
+
+    common_ids = fetched_df.index.intersection(stored_df.index)
+    stored_signature = _row_signature(stored_df.loc[common_ids])
+    fetched_signature = _row_signature(fetched_df.loc[common_ids])
+    updated_ids = common_ids[(stored_signature != fetched_signature).to_numpy()]
+    added_ids = fetched_df.index.difference(stored_df.index)
+    removed_ids = stored_df.index.difference(fetched_df.index)
+
+    changes = {"added": len(added_ids), "updated": len(updated_ids), "removed": len(removed_ids)}
+    if not (len(added_ids) or len(updated_ids) or len(removed_ids)):
+        return stored_df, changes
+
+    merged_df = pd.concat([
+        stored_df.drop(index=updated_ids.append(removed_ids)),
+        fetched_df.loc[updated_ids.append(added_ids)],
+    ])
+    return compact_players_frame(merged_df.sort_index()), changes
+
+def read_players_store(columns=None):
+    """Read the local store into a new pandas frame, optionally only the requested columns
+
+    The file is memory-mapped, but converting to pandas still copies every column read, so pass
+    columns to keep reads small.
+    """
+    if not os.path.exists(PLAYERS_STORE_PATH):
+        return None
+    if columns is not None:
+        # The player_id index is stored as a column, keep it so the frame stays indexed by player_id
+        columns = ["player_id"] + [column for column in columns if column != "player_id"]
+    table = pq.read_table(PLAYERS_STORE_PATH, columns=columns, memory_map=True)
+    # Columns that were entirely empty at write time come back as object, so re-apply their dtypes
+    return compact_players_frame(table.to_pandas())
+
+def read_players_store_meta():
+    if not os.path.exists(PLAYERS_STORE_META_PATH):
+        return {}
+    with open(PLAYERS_STORE_META_PATH) as meta_file:
+        return json.load(meta_file)
+
+def store_age():
+    """Time since the store was last refreshed, or None when it has never been"""
+    refreshed_at = read_players_store_meta().get("refreshed_at")
+    if refreshed_at is None or not os.path.exists(PLAYERS_STORE_PATH):
+        return None
+    return datetime.datetime.now(datetime.timezone.utc) - datetime.datetime.fromisoformat(refreshed_at)
+
+def store_is_stale(max_age=PLAYERS_STORE_MAX_AGE):
+    age = store_age()
+    return age is None or age > max_age
+
+def refresh_players_store():
+    """Download Sleeper's players database and upsert the changes into the local store
+
+    Sleeper has no delta endpoint, so the download is always complete, but the store file is only
+    rewritten when players were added, changed or removed.
+    """
+    from sleeper_wrapper import Players
+
+    fetched_df = players_to_frame(Players().get_all_players())
+    stored_df = read_players_store()
+    merged_df, changes = merge_players(stored_df, fetched_df)
+
+    os.makedirs(os.path.dirname(PLAYERS_STORE_PATH), exist_ok=True)
+    if merged_df is not stored_df:
+        atomic_write(PLAYERS_STORE_PATH, merged_df.to_parquet)
+
+    with open(PLAYERS_STORE_META_PATH, "w") as meta_file:
+        json.dump({"refreshed_at": datetime.datetime.now(datetime.timezone.utc).isoformat(), **changes}, meta_file)
+    return changes
+
+def refresh_players_store_if_stale(max_age=PLAYERS_STORE_MAX_AGE):
+    # Only one process downloads, the others wait and then find the store fresh
+    with single_flight("sleeper_players_store"):
+        if store_is_stale(max_age):
+            refresh_players_store()
+
+def load_players_store(columns=None):
+    """Local Sleeper players frame indexed by player_id, refreshed at most once a day
+
+    Only a missing store is downloaded before returning; a stale one is served while it refreshes in the background.
+    """
+    if store_age() is None:
+        refresh_players_store_if_stale()
+    elif store_is_stale():
+        run_in_background("sleeper_players_store", refresh_players_store_if_stale)
+    return read_players_store(columns=columns)
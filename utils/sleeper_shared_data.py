@@ -0,0 +1,91 @@
+import datetime
+import streamlit as st
+import pandas as pd
+
+from utils.ktc_index import build_ktc_index, sleeper_player_keys
+from utils.sleeper_players_store import PLAYERS_STORE_MAX_AGE, load_players_store, refresh_players_store_if_stale, store_age
+from utils.draft_pick_ledger import build_pick_value_index
+from utils.nfl_schedule import SCHEDULE_STORE_MAX_AGE, load_season_games, build_team_game_table, refresh_schedule_store_if_stale, schedule_store_age
+from utils.shared_cache import shared_cache
+from utils.background_refresh import start_refresh_scheduler
+from utils.timing import span
+
+# League-independent data shared by every Sleeper league the app evaluates: one KTC scrape,
+# one players database and one season schedule, however many leagues are loaded.
+# All three are renewed in the background before they expire (see utils.background_refresh), so the
+# in-memory caches below only need to be short enough to pick up the renewed copies.
+
+KTC_MAX_AGE = datetime.timedelta(days=1)
+
+@st.cache_resource(ttl=3600)  # Shared read-only frames, re-read hourly, not pickled on every cache hit
+def get_players_with_keys():
+    """The players store and its normalized name keys, cached together so they always describe the same rows"""
+    players_df = load_players_store()
+    return players_df, sleeper_player_keys(players_df)
+
+def get_all_players():
+    return get_players_with_keys()[0]
+
+@shared_cache(ttl=KTC_MAX_AGE.total_seconds(), stale_while_revalidate=True)  # One scrape a day for all app processes
+def load_keeptradecut_dataframe():
+    # The scraper pulls in BeautifulSoup and tqdm, which only the background refresh needs
+    from scraper.ktc_to_csv import scrape_ktc
+
+    with span("ktc.scrape"):
+        ktc_data = scrape_ktc()
+    df = pd.DataFrame(ktc_data)
+
+    return df
+
+@st.cache_data(ttl=3600)  # Cache for 1 hour
+def get_keeptradecut_dataframe():
+    return load_keeptradecut_dataframe()
+
+@st.cache_data(ttl=3600)  # Cache for 1 hour, rebuilt once per scrape
+def get_ktc_index():
+    return build_ktc_index(get_keeptradecut_dataframe())
+
+@st.cache_data(ttl=3600)  # Cache for 1 hour, rebuilt once per scrape
+def get_ktc_pick_values():
+    return build_pick_value_index(get_keeptradecut_dataframe())
+
+@st.cache_data(ttl=3600)  # Cache for 1 hour
+def get_season_team_games(current_year, timezone):
+    """The season's (week, team) -> game table, prefetched into the local schedule store"""
+    season_games_df, unparsed_short_names = load_season_games(current_year, timezone)
+    return build_team_game_table(season_games_df), unparsed_short_names
+
+def ktc_age():
+    age = load_keeptradecut_dataframe.cache_age()
+    return None if age is None else datetime.timedelta(seconds=age)
+
+def refresh_tasks(current_year):
+    """The data the background scheduler keeps renewed, see run_refresh_cycle"""
+    return [
+        {
+            "name": "KTC values",
+            "age": ktc_age,
+            "max_age": KTC_MAX_AGE,
+            "refresh": lambda renewed_within: load_keeptradecut_dataframe.refresh(renewed_within.total_seconds()),
+        },
+        {
+            "name": "Sleeper players",
+            "age": store_age,
+            "max_age": PLAYERS_STORE_MAX_AGE,
+            "refresh": refresh_players_store_if_stale,
+        },
+        {
+            "name": "NFL schedule",
+            "age": lambda: schedule_store_age(current_year),
+            "max_age": SCHEDULE_STORE_MAX_AGE,
+            "refresh": lambda renewed_within: refresh_schedule_store_if_stale(current_year, renewed_within),
+        },
+    ]
+
+@st.cache_resource  # One scheduler thread per process
+def start_background_refresh():
+    return start_refresh_scheduler(lambda: refresh_tasks(datetime.datetime.now().year))
+
+def data_ages():
+    """(name, age) for each background-refreshed dataset, age None when it has not been loaded yet"""
+    return [(task["name"], task["age"]()) for task in refresh_tasks(datetime.datetime.now().year)]
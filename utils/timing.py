@@ -0,0 +1,75 @@
+import os
+import json
+import time
+import datetime
+import contextvars
+import pandas as pd
+
+# Lightweight timing spans around the app's major stages (scraping, CSV parsing, combining projections,
+# valuing rosters, drawing charts). Spans are only recorded while a rerun is being timed, see main.py:
+# enable with ?timing=1 in the URL or FF_TIMING=1, and set FF_TIMING_LOG to also append each rerun to a
+# JSON-lines file. When timing is off a span costs one context variable lookup.
+
+TIMING_ENV_VAR = "FF_TIMING"
+TIMING_LOG_ENV_VAR = "FF_TIMING_LOG"
+TIMING_QUERY_PARAM = "timing"
+
+# The spans of the rerun being timed, or None. Context variables are not copied into pool threads,
+# so work fanned out to worker threads is timed by the span around the whole fan-out.
+_rerun_spans = contextvars.ContextVar("rerun_spans", default=None)
+_span_depth = contextvars.ContextVar("span_depth", default=0)
+
+class span:
+    """Context manager timing one stage of the current rerun, nested spans are indented in the panel"""
+    __slots__ = ("name", "spans", "start", "depth_token")
+
+    def __init__(self, name):
+        self.name = name
+        self.spans = _rerun_spans.get()
+
+    def __enter__(self):
+        if self.spans is not None:
+            self.depth_token = _span_depth.set(_span_depth.get() + 1)
+            self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info):
+        if self.spans is not None:
+            end = time.perf_counter()
+            _span_depth.reset(self.depth_token)
+            self.spans.append({"name": self.name, "depth": _span_depth.get(), "start": self.start, "seconds": end - self.start})
+        return False
+
+def begin_rerun():
+    """Start collecting spans for this rerun"""
+    _rerun_spans.set([])
+
+def end_rerun():
+    """Stop collecting and return this rerun's spans, in the order they started"""
+    spans = _rerun_spans.get() or []
+    _rerun_spans.set(None)
+    return sorted(spans, key=lambda item: item["start"])
+
+def timing_requested(query_params):
+    return query_params.get(TIMING_QUERY_PARAM) == "1" or os.environ.get(TIMING_ENV_VAR) == "1"
+
+def spans_frame(spans):
+    """Spans as a table for the debug panel, stage names indented by nesting depth (em spaces survive rendering)"""
+    return pd.DataFrame({
+        "Stage": ["\u2003" * item["depth"] + item["name"] for item in spans],
+        "ms": [round(item["seconds"] * 1000, 1) for item in spans],
+    }, columns=["Stage", "ms"])
+
+def append_spans_jsonl(path, page, spans):
+    """Append one JSON line for the rerun, with offsets relative to its first span"""
+    origin = spans[0]["start"] if spans else 0
+    record = {
+        "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+        "page": page,
+        "spans": [
+            {"name": item["name"], "depth": item["depth"], "offset_ms": round((item["start"] - origin) * 1000, 3), "ms": round(item["seconds"] * 1000, 3)}
+            for item in spans
+        ],
+    }
+    with open(path, "a") as log_file:
+        log_file.write(json.dumps(record) + "\n")
@@ -0,0 +1,159 @@
+import numpy as np
+import pandas as pd
+
+# Searches 1-for-1, 2-for-1, 1-for-2 and 2-for-2 trades between one roster and every other roster in a league.
+# Each team's players and picks are laid out as value arrays once, every combination of one or two assets is
+# a row of index pairs, and only combinations inside the KTC acceptance band are ever paired up.
+
+# (assets given, assets received)
+TRADE_SHAPES = [(1, 1), (2, 1), (1, 2), (2, 2)]
+
+# Starting slots used to measure positional strength (superflex, so two QBs)
+STARTER_SLOTS = {"QB": 2, "RB": 2, "WR": 3, "TE": 1}
+PICK_POSITION = "PICK"
+
+# Assets below this value or outside each team's most valuable MAX_ASSETS_PER_TEAM are not traded
+MIN_ASSET_VALUE = 500
+MAX_ASSETS_PER_TEAM = 20
+
+DEFAULT_VALUE_TOLERANCE = 0.15
+DEFAULT_NEED_WEIGHT = 0.5
+
+def build_team_assets(league_roster_df, draft_order_df, player_names=None):
+    """One frame of every tradable asset in the league: owner_id, asset name, position and KTC value"""
+    players_df = league_roster_df[["owner_id", "player_id", "fantasy_positions", "search_first_name", "search_last_name", "KTC Value"]]
+    names = players_df["search_first_name"].astype(str) + " " + players_df["search_last_name"].astype(str)
+    if player_names is not None:
+        names = players_df["player_id"].map(player_names).fillna(names)
+    player_assets = pd.DataFrame({
+        "owner_id": players_df["owner_id"].to_numpy(),
+        "asset": names.to_numpy(),
+        "position": players_df["fantasy_positions"].str[0].fillna("N/A").to_numpy(),
+        "value": players_df["KTC Value"].to_numpy(dtype=float),
+    })
+    pick_assets = pd.DataFrame({
+        "owner_id": draft_order_df["owner_id"].to_numpy(),
+        "asset": (draft_order_df["KTC Pick Name"] + " (" + draft_order_df["overall_pick"].astype(str) + " overall)").to_numpy(),
+        "position": PICK_POSITION,
+        "value": draft_order_df["KTC Value"].to_numpy(dtype=float),
+    })
+    return pd.concat([player_assets, pick_assets], ignore_index=True)
+
+def position_strength(assets_df, slots=STARTER_SLOTS):
+    """Sum of each team's top starter-slot values at every position, as an owner x position frame"""
+    players_df = assets_df[assets_df["position"].isin(list(slots))].sort_values(by="value", ascending=False)
+    depth = players_df.groupby(["owner_id", "position"]).cumcount()
+    starters_df = players_df[depth.to_numpy() < players_df["position"].map(slots).to_numpy()]
+    strength = starters_df.pivot_table(index="owner_id", columns="position", values="value", aggfunc="sum", fill_value=0)
+    return strength.reindex(columns=list(slots), fill_value=0)
+
+def positional_need(strength, owner_id):
+    """How far below the league average a team's starters are at each position, from 0 (no need) to 1"""
+    league_average = strength.mean()
+    if owner_id not in strength.index:
+        return pd.Series(1.0, index=strength.columns)
+    shortfall = (league_average - strength.loc[owner_id]) / league_average.replace(0, np.nan)
+    return shortfall.fillna(0).clip(0, 1)
+
+def _team_arrays(assets_df, owner_id, need=None, need_weight=0.0):
+    """A team's tradable assets, most valuable first, with raw and need-adjusted value arrays"""
+    team_df = assets_df[(assets_df["owner_id"] == owner_id) & (assets_df["value"] >= MIN_ASSET_VALUE)]
+    team_df = team_df.nlargest(MAX_ASSETS_PER_TEAM, "value").reset_index(drop=True)
+    values = team_df["value"].to_numpy()
+    if need is None:
+        adjusted = values
+    else:
+        adjusted = values * (1 + need_weight * team_df["position"].map(need).fillna(0).to_numpy())
+    return team_df, values, adjusted
+
+def _combinations(asset_count, size):
+    """Index rows for every combination of size assets, shape (combinations, size)"""
+    if size == 1:
+        return np.arange(asset_count)[:, None]
+    first, second = np.triu_indices(asset_count, k=1)
+    return np.stack([first, second], axis=1)
+
+def _band_pairs(give_values, get_values, tolerance):
+    """Every (give, get) combination pair whose KTC values are within tolerance of each other
+
+    get_values must be sorted. The matches for each give combination are a contiguous range found by binary
+    search, so pairs outside the band are never materialized.
+    """
+    low = np.searchsorted(get_values, give_values * (1 - tolerance), side="left")
+    high = np.searchsorted(get_values, give_values / (1 - tolerance), side="right")
+    counts = high - low
+    give_rows = np.repeat(np.arange(len(give_values)), counts)
+    # Position of each pair inside its give combination's range
+    range_offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+    get_rows = low[give_rows] + range_offsets
+    return give_rows, get_rows
+
+def search_trades_with_team(my_team, their_team, tolerance=DEFAULT_VALUE_TOLERANCE, shapes=TRADE_SHAPES, top_n=50):
+    """Best trades with one partner, as (shape, give index rows, get index rows, give value, get value, score) arrays
+
+    my_team and their_team are (team_df, values, adjusted) tuples from _team_arrays.
+    """
+    my_df, my_values, my_adjusted = my_team
+    their_df, their_values, their_adjusted = their_team
+    results = []
+    for give_size, get_size in shapes:
+        if len(my_df) < give_size or len(their_df) < get_size:
+            continue
+        give_combos = _combinations(len(my_df), give_size)
+        get_combos = _combinations(len(their_df), get_size)
+
+        give_values = my_values[give_combos].sum(axis=1)
+        get_values = their_values[get_combos].sum(axis=1)
+        order = np.argsort(get_values)
+        get_combos, get_values = get_combos[order], get_values[order]
+
+        give_rows, get_rows = _band_pairs(give_values, get_values, tolerance)
+        if len(give_rows) == 0:
+            continue
+
+        # Score is what the trade is worth to me after positional need, in KTC points
+        scores = their_adjusted[get_combos[get_rows]].sum(axis=1) - my_adjusted[give_combos[give_rows]].sum(axis=1)
+        if len(scores) > top_n:
+            best = np.argpartition(-scores, top_n)[:top_n]
+            give_rows, get_rows, scores = give_rows[best], get_rows[best], scores[best]
+
+        results.append(((give_size, get_size), give_combos[give_rows], get_combos[get_rows], give_values[give_rows], get_values[get_rows], scores))
+    return results
+
+def _describe(team_df, combos):
+    assets = team_df["asset"].to_numpy()
+    positions = team_df["position"].to_numpy()
+    return [
+        " + ".join(f"{assets[i]} ({positions[i]})" for i in combo)
+        for combo in combos
+    ]
+
+def find_trades(assets_df, my_owner_id, team_names, tolerance=DEFAULT_VALUE_TOLERANCE, need_weight=DEFAULT_NEED_WEIGHT, shapes=TRADE_SHAPES, top_n=50):
+    """Search every other roster for trades that are fair by KTC value and fill my positional needs
+
+    Returns the top_n trades by need-adjusted value, best first.
+    """
+    need = positional_need(position_strength(assets_df), my_owner_id)
+    my_team = _team_arrays(assets_df, my_owner_id, need, need_weight)
+
+    frames = []
+    for owner_id in assets_df["owner_id"].dropna().unique():
+        if owner_id == my_owner_id:
+            continue
+        their_team = _team_arrays(assets_df, owner_id, need, need_weight)
+        for shape, give_combos, get_combos, give_values, get_values, scores in search_trades_with_team(my_team, their_team, tolerance, shapes, top_n):
+            frames.append(pd.DataFrame({
+                "Partner": team_names.get(owner_id, owner_id),
+                "Shape": f"{shape[0]}-for-{shape[1]}",
+                "You Give": _describe(my_team[0], give_combos),
+                "You Get": _describe(their_team[0], get_combos),
+                "Give KTC Value": give_values,
+                "Get KTC Value": get_values,
+                "KTC Value Delta": get_values - give_values,
+                "Need Adjusted Score": scores,
+            }))
+
+    if not frames:
+        return pd.DataFrame(columns=["Partner", "Shape", "You Give", "You Get", "Give KTC Value", "Get KTC Value", "KTC Value Delta", "Need Adjusted Score"])
+    trades_df = pd.concat(frames, ignore_index=True)
+    return trades_df.nlargest(top_n, "Need Adjusted Score").reset_index(drop=True)